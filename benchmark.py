@@ -0,0 +1,230 @@
+"""Benchmark of sorting algorithms
+
+Every sort of sort module is run on every data distribution of every size. Wall
+time (best of --repeat runs), number of comparisons and peak memory allocated
+during the sort are measured. Results are written as JSON and optionally compared
+with a baseline produced by earlier run: the run fails if any sort became slower
+than the baseline by more than --tolerance or made more comparisons.
+
+Usage:
+    python benchmark.py --sizes 10,1000,100000 --output results.json
+    python benchmark.py --output new.json --baseline results.json --tolerance 0.25
+
+Peak memory is measured with tracemalloc."""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+
+import tracemalloc
+
+import sort
+
+def random_data(size, rng):
+    return [rng.randrange(size) for i in range(size)]
+
+def sorted_data(size, rng):
+    return [i for i in range(size)]
+
+def reversed_data(size, rng):
+    return [i for i in range(size, 0, -1)]
+
+def few_unique_data(size, rng):
+    return [rng.randrange(10) for i in range(size)]
+
+def sawtooth_data(size, rng):
+    tooth = max(size // 10, 1)
+    return [i % tooth for i in range(size)]
+
+def organ_pipe_data(size, rng):
+    return [min(i, size - i) for i in range(size)]
+
+def nearly_sorted_data(size, rng):
+    data = [i for i in range(size)]
+    for i in range(max(size // 100, 1)):
+        a, b = rng.randrange(size), rng.randrange(size)
+        data[a], data[b] = data[b], data[a]
+    return data
+
+DISTRIBUTIONS = {
+    'random': random_data,
+    'sorted': sorted_data,
+    'reversed': reversed_data,
+    'few_unique': few_unique_data,
+    'sawtooth': sawtooth_data,
+    'organ_pipe': organ_pipe_data,
+    'nearly_sorted': nearly_sorted_data,
+}
+
+def _external_sort(collection, compare_func=None):
+    collection[:] = list(sort.external_sort(collection, compare_func))
+
+def _without_compare(sort_func):
+    def run(collection, compare_func=None):
+        sort_func(collection)
+    return run
+
+# name -> (function sorting collection with optional compare_func, maximal size to be
+# benchmarked or None if there is no limit)
+SORTS = {
+    'selection_sort': (sort.selection_sort, 10000),
+    'bubble_sort': (sort.bubble_sort, 10000),
+    'coctail_sort': (sort.coctail_sort, 10000),
+    'insertion_sort': (sort.insertion_sort, 10000),
+    'comb_sort': (sort.comb_sort, None),
+    'shell_sort': (sort.shell_sort, None),
+    'merge_sort': (sort.merge_sort, None),
+    'bottom_up_merge_sort': (sort.bottom_up_merge_sort, None),
+    'tim_sort': (sort.tim_sort, None),
+    'intro_sort': (sort.intro_sort, None),
+    'network_sort': (sort.network_sort, 16),
+    'external_sort': (_external_sort, None),
+    'parallel_merge_sort': (_without_compare(sort.parallel_merge_sort), None),
+    'numeric_sort': (_without_compare(sort.numeric_sort), None),
+    'counting_sort': (_without_compare(sort.counting_sort), None),
+    'radix_sort': (_without_compare(sort.radix_sort), None),
+    'bucket_sort': (_without_compare(sort.bucket_sort), None),
+    'sort': (_without_compare(sort.sort), None),
+}
+
+# sorts which don't call compare_func for comparisons
+NON_COMPARISON_SORTS = ('parallel_merge_sort', 'numeric_sort', 'counting_sort', 'radix_sort', 'bucket_sort', 'sort')
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+def _measure_time(sort_func, data, repeat):
+    best = None
+    for i in range(repeat):
+        collection = data[:]
+        gc.collect()
+        started = time.perf_counter()
+        sort_func(collection)
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def _count_comparisons(sort_func, data):
+    counter = [0]
+
+    def counting_compare(a, b):
+        counter[0] += 1
+        return sort.compare(a, b)
+
+    sort_func(data[:], counting_compare)
+    return counter[0]
+
+def _measure_peak_memory(sort_func, data):
+    collection = data[:]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        sort_func(collection)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_benchmark(sorts=None, distributions=None, sizes=DEFAULT_SIZES, repeat=3, seed=0):
+    """Run benchmark and return list of results
+
+        sorts - names of sorts from SORTS, all by default
+        distributions - names of distributions from DISTRIBUTIONS, all by default
+        sizes - sizes of data to be sorted
+        repeat - number of runs, the best time is reported
+        seed - random seed, the same seed produces the same data
+
+        Every result is a dict with sort, distribution, size, time (seconds),
+        comparisons (None for non-comparison sorts) and peak_memory (bytes) keys.
+        Sorts are skipped for sizes bigger than their maximal benchmarked size."""
+    results = []
+    for size in sizes:
+        for distribution in sorted(distributions or DISTRIBUTIONS):
+            data = DISTRIBUTIONS[distribution](size, random.Random(seed))
+            expected = sorted(data)
+            for name in sorted(sorts or SORTS):
+                sort_func, max_size = SORTS[name]
+                if max_size is not None and size > max_size:
+                    continue
+
+                collection = data[:]
+                sort_func(collection)
+                if collection != expected:
+                    raise AssertionError('%s produced unsorted result' % name)
+
+                results.append({
+                    'sort': name,
+                    'distribution': distribution,
+                    'size': size,
+                    'time': _measure_time(sort_func, data, repeat),
+                    'comparisons': None if name in NON_COMPARISON_SORTS else _count_comparisons(sort_func, data),
+                    'peak_memory': _measure_peak_memory(sort_func, data),
+                })
+    return results
+
+def find_regressions(results, baseline, tolerance=0.25, min_time=0.001):
+    """Compare results with baseline results and return list of regression descriptions
+
+        Result is a regression if its time exceeds baseline time by more than
+        tolerance share and by more than min_time seconds, which filters out the
+        noise of very short runs, or if it made more comparisons than baseline.
+        Results missing from baseline are ignored."""
+    baseline_results = dict(((result['sort'], result['distribution'], result['size']), result) for result in baseline)
+    regressions = []
+    for result in results:
+        previous = baseline_results.get((result['sort'], result['distribution'], result['size']))
+        if previous is None:
+            continue
+
+        case = '%s on %s data of size %d' % (result['sort'], result['distribution'], result['size'])
+        if result['time'] > previous['time'] * (1 + tolerance) and result['time'] - previous['time'] > min_time:
+            regressions.append('%s: time %.6fs, baseline %.6fs' % (case, result['time'], previous['time']))
+        if previous['comparisons'] is not None and result['comparisons'] > previous['comparisons']:
+            regressions.append('%s: %d comparisons, baseline %d' % (case, result['comparisons'], previous['comparisons']))
+    return regressions
+
+def _names(value):
+    return [name for name in value.split(',') if name]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of sorting algorithms')
+    parser.add_argument('--sorts', type=_names, help='comma separated sorts, all by default')
+    parser.add_argument('--distributions', type=_names, help='comma separated distributions, all by default')
+    parser.add_argument('--sizes', type=lambda value: [int(size) for size in _names(value)], default=DEFAULT_SIZES,
+        help='comma separated sizes, from 10 to 10000000')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, the best time is reported')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the data')
+    parser.add_argument('--output', help='JSON file to write results to')
+    parser.add_argument('--baseline', help='JSON file with baseline results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown share')
+    args = parser.parse_args(argv)
+
+    for name in args.sorts or []:
+        if name not in SORTS:
+            parser.error('unknown sort %s' % name)
+    for name in args.distributions or []:
+        if name not in DISTRIBUTIONS:
+            parser.error('unknown distribution %s' % name)
+
+    results = run_benchmark(args.sorts, args.distributions, args.sizes, args.repeat, args.seed)
+    for result in results:
+        print('%-20s %-14s %9d %12.6fs %12s comparisons %12s bytes' % (result['sort'], result['distribution'],
+            result['size'], result['time'], result['comparisons'], result['peak_memory']))
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = find_regressions(results, json.load(baseline), args.tolerance)
+        for regression in regressions:
+            print('REGRESSION %s' % regression)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,2529 @@
+"""Implementation of sorting algorithms
+
+Functions:
+sort(collection, key, stable) - adaptive sort choosing one of the sorts below.
+argsort(collection, key, stable) - permutation sorting collection.
+lexsort(columns, descending) - permutation sorting rows of columns lexicographically.
+apply_permutation(collection, order) - in-place reordering of collection.
+selection_sort(collection, compare_func, key) - in-place comparison sort.
+bubble_sort(collection, compare_func, key) - in-place comparison sort.
+coctail_sort(collection, compare_func, key) - in-place comparison sort.
+insertion_sort(collection, compare_func, key) - in-place comparison sort.
+shell_sort(collection, compare_func, gap_sequence, key) - in-place comparison sort.
+comb_sort(collection, compare_func, key) - in-place comparison sort.
+merge_sort(collection, compare_func, key, unique, reduce) - comparison sort, optionally
+    combining items with equal keys.
+bottom_up_merge_sort(collection, compare_func, key) - comparison sort.
+tim_sort(collection, compare_func, key) - in-place comparison sort.
+intro_sort(collection, compare_func, key) - in-place comparison sort.
+network_sort(collection, compare_func, key) - comparison sort of up to 16 items.
+sort_many(collections, key) - in-place sort of many small lists.
+partial_sort(collection, k, compare_func, key) - in-place sort of k smallest items.
+select(collection, k, compare_func, key) - in-place selection of k-th smallest item.
+nsmallest(iterable, n, compare_func, key) - n smallest items of iterable.
+nlargest(iterable, n, compare_func, key) - n largest items of iterable.
+SortedList(iterable, compare_func, key) - list kept sorted under inserts and deletes.
+parallel_merge_sort(collection, compare_func, key, workers, threshold) - multi-process
+    comparison sort.
+numeric_sort(collection, use_numpy) - vectorized sort of numeric lists and arrays.
+counting_sort(collection, key) - integer sort.
+radix_sort(collection, key, radix_bits) - integer and string sort.
+bucket_sort(collection, key, bucket_count) - numeric sort.
+external_sort(records, compare_func, key, ...) - out-of-core comparison sort.
+external_sort_file(source, destination, compare_func, key, ...) - sort lines of
+    a file larger than memory.
+sort_records_file(source, record_format, key_format, key_offset, destination) - sort
+    binary file of fixed size records.
+
+Every comparison sort accepts either compare_func, a three-way compare function, or key,
+a function computing a comparison key for each item. Keys are computed once per
+item and compared with native < which is considerably faster than calling
+compare_func for every comparison. Without both of them items are compared
+directly.
+
+Comparison sorts, counting_sort, radix_sort, bucket_sort and external_sort accept
+stats, a SortStats instance collecting number of comparisons, moves, passes,
+merges and per-phase timings.
+
+Submodule sort.aio has asyncio versions of merge_sort, "python -m sort" sorts
+lines of files like Unix sort. NumPy, multiprocessing and the modules needed by
+the external sorts are imported on the first use only, so importing the package
+is cheap."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import cmp_to_key
+from heapq import heapify, heappop, heapreplace, nlargest as _heap_nlargest, nsmallest as _heap_nsmallest
+from importlib import import_module
+from math import ceil, sqrt
+from operator import itemgetter
+from os import cpu_count
+from time import time
+
+# functions of submodules imported on the first access, so that importing the
+# package doesn't import their dependencies
+_LAZY_FUNCTIONS = {
+    'external_sort': '_external',
+    'external_sort_file': '_external',
+    'sort_records_file': '_external',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_FUNCTIONS.get(name)
+    if module_name is None:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    function = getattr(import_module('.' + module_name, __name__), name)
+    globals()[name] = function
+    return function
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_FUNCTIONS))
+
+def compare(a, b):
+    """Default compare method for integer items.
+
+    Compare integer a and b and return integer value less, greater or equal to 0
+    if a < b, a > b or a == b respectively"""
+
+    if a == b:
+        return 0
+    else:
+        return -1 if a < b else 1
+
+class SortStats(object):
+    """Counters and timings collected by a sort
+
+        comparisons - number of item comparisons
+        moves - number of item writes to the sorted list and to merge buffers
+        passes - number of passes: passes over the list of selection_sort,
+            bubble_sort and coctail_sort, gap passes of shell_sort and comb_sort,
+            scans for runs of merge_sort and tim_sort, merge passes of low_memory
+            merge_sort and external_sort, partitions of intro_sort,
+            digit passes and bucket splits of radix_sort
+        merges - number of merges of two runs
+        phases - dict of phase name and seconds spent in it
+
+        Pass an instance as stats argument of a sort. The same instance may be
+        passed to several sorts to accumulate their counters. Without stats sorts
+        run without any instrumentation."""
+
+    def __init__(self):
+        self.comparisons = 0
+        self.moves = 0
+        self.passes = 0
+        self.merges = 0
+        self.phases = {}
+
+    def add_phase(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def as_dict(self):
+        """Flat dict of metrics suitable for metrics pipelines, phase timings are
+            reported as phase.<name> keys"""
+        metrics = {
+            'comparisons': self.comparisons,
+            'moves': self.moves,
+            'passes': self.passes,
+            'merges': self.merges,
+        }
+        for phase, seconds in self.phases.items():
+            metrics['phase.' + phase] = seconds
+        return metrics
+
+    def __repr__(self):
+        return 'SortStats(%s)' % ', '.join('%s=%r' % item for item in sorted(self.as_dict().items()))
+
+class _CountedItem(object):
+    """Item wrapper counting comparisons"""
+    __slots__ = ('stats', 'value', 'item')
+
+    def __init__(self, stats, value, item):
+        self.stats = stats
+        self.value = value
+        self.item = item
+
+    def __lt__(self, other):
+        self.stats.comparisons += 1
+        return self.value < other.value
+
+class _PositionedItem(object):
+    """Item wrapper ordering items by compare_func and equal ones by position"""
+    __slots__ = ('compare_func', 'position', 'item')
+
+    def __init__(self, compare_func, position, item):
+        self.compare_func = compare_func
+        self.position = position
+        self.item = item
+
+    def __lt__(self, other):
+        result = self.compare_func(self.item, other.item)
+        return result < 0 or result == 0 and self.position < other.position
+
+class _CountingList(list):
+    """List counting item writes"""
+    __slots__ = ('stats',)
+
+    def __init__(self, stats, items):
+        list.__init__(self, items)
+        self.stats = stats
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.stats.moves += len(value)
+        else:
+            self.stats.moves += 1
+        list.__setitem__(self, index, value)
+
+def _sort_with_stats(collection, compare_func, key, stats, native_sort, args, stable):
+    """Instrumented version of _sort_by_key. Items are wrapped to count comparisons
+        and put to a list counting writes, native_sort counts its passes and merges."""
+    started = time()
+    if key is not None:
+        values = [(key(item), position) for position, item in enumerate(collection)]
+    elif compare_func is not None and stable:
+        wrap = cmp_to_key(compare_func)
+        values = [wrap(item) for item in collection]
+    elif compare_func is not None:
+        values = [_PositionedItem(compare_func, position, item) for position, item in enumerate(collection)]
+    else:
+        values = collection
+    decorated = _CountingList(stats, [_CountedItem(stats, value, item) for value, item in zip(values, collection)])
+    stats.add_phase('decorate', time() - started)
+
+    started = time()
+    native_sort(decorated, *args, stats=stats)
+    stats.add_phase('sort', time() - started)
+
+    started = time()
+    collection[:] = [counted.item for counted in decorated]
+    stats.add_phase('undecorate', time() - started)
+
+def _sort_by_key(collection, compare_func, key, stats, native_sort, *args, stable=False):
+    """Run native_sort over collection ordered by compare_func or key
+
+        stats - SortStats instance or None
+        native_sort - sort implementation which compares items with < only
+        args - extra arguments passed to native_sort
+        stable - whether native_sort keeps the order of equal items itself
+
+        With key every item is decorated once as (key(item), position, item) tuple.
+        Positions are unique, so the items themselves are never compared and
+        stability is preserved. compare_func is kept for backward compatibility:
+        items are wrapped with cmp_to_key, so it is still called once per
+        comparison. For unstable native_sort they are wrapped with their positions
+        instead, so items equal by compare_func are ordered by position.
+        Without both of them the items are compared directly, which gives the same
+        order as the default compare function."""
+
+    if compare_func is not None and key is not None:
+        raise ValueError('compare_func and key are mutually exclusive')
+
+    if stats is not None:
+        _sort_with_stats(collection, compare_func, key, stats, native_sort, args, stable)
+    elif key is not None:
+        decorated = [(key(item), position, item) for position, item in enumerate(collection)]
+        native_sort(decorated, *args)
+        collection[:] = [item for _, _, item in decorated]
+    elif compare_func is not None and stable:
+        wrap = cmp_to_key(compare_func)
+        decorated = [wrap(item) for item in collection]
+        native_sort(decorated, *args)
+        collection[:] = [wrapped.obj for wrapped in decorated]
+    elif compare_func is not None:
+        decorated = [_PositionedItem(compare_func, position, item) for position, item in enumerate(collection)]
+        native_sort(decorated, *args)
+        collection[:] = [positioned.item for positioned in decorated]
+    else:
+        native_sort(collection, *args)
+
+def selection_sort(collection, compare_func=None, key=None, stats=None):
+    """Selection sort implementation
+    
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+    
+        The algorithm divides the input list into two parts: the sublist of items
+        already sorted, which is built up from left to right at the front (left) of
+        the list, and the sublist of items remaining to be sorted that occupy the
+        rest of the list. Initially, the sorted sublist is empty and the unsorted
+        sublist is the entire input list. The algorithm proceeds by finding the
+        smallest (or largest, depending on sorting order) element in the unsorted
+        sublist, exchanging it with the leftmost unsorted element (putting it in
+        sorted order), and moving the sublist boundaries one element to the right.
+        Worst case perfomance - O(n^2)
+        Best case perfomance - O(n^2)
+        Average case perfomance - O(n^2)
+        Worst case space complexity - O(n) total, O(1) auxiliary
+        (http://en.wikipedia.org/wiki/Selection_sort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    _sort_by_key(collection, compare_func, key, stats, _selection_sort)
+
+def _selection_sort(collection, stats=None):
+    for position in range(len(collection) - 1):
+        if stats is not None:
+            stats.passes += 1
+        min = position
+        for tail in range(position + 1, len(collection)):
+            if collection[tail] < collection[min]:
+                min = tail
+
+        if position != min:
+            collection[position], collection[min] = collection[min], collection[position]
+
+def bubble_sort(collection, compare_func=None, key=None, stats=None):
+    """Bubble sort implementation
+    
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+    
+        works by repeatedly stepping through the list to be sorted, comparing each
+        pair of adjacent items and swapping them if they are in the wrong order.
+        The pass through the list is repeated until no swaps are needed, which
+        indicates that the list is sorted.
+        Worst case perfomance - O(n^2)
+        Best case perfomance - O(n)
+        Average case perfomance - O(n^2)
+        Worst case space complexity - O(1) auxiliary
+        (http://en.wikipedia.org/wiki/Bubble_sort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    _sort_by_key(collection, compare_func, key, stats, _bubble_sort, stable=True)
+
+def _bubble_sort(collection, stats=None):
+    unsorted_head = len(collection)
+    while unsorted_head != 0:
+        if stats is not None:
+            stats.passes += 1
+        last_swap_position = 0
+        for position in range(unsorted_head - 1):
+            if collection[position + 1] < collection[position]:
+                collection[position + 1], collection[position] = collection[position], collection[position + 1]
+                last_swap_position = position + 1
+
+        unsorted_head = last_swap_position
+
+def coctail_sort(collection, compare_func=None, key=None, stats=None):
+    """Coctail sort implementation
+
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+
+        Cocktail sort is a slight variation of bubble sort. It differs in that
+        instead of repeatedly passing through the list from bottom to top, it
+        passes alternately from bottom to top and then from top to bottom. It
+        can achieve slightly better performance than a standard bubble sort.
+        Worst case perfomance - O(n^2)
+        Best case perfomance - O(n)
+        Average case perfomance - O(n^2)
+        Worst case space complexity - O(1)
+        (http://en.wikipedia.org/wiki/Cocktail_sort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    _sort_by_key(collection, compare_func, key, stats, _coctail_sort, stable=True)
+
+def _coctail_sort(collection, stats=None):
+    start = 0
+    end = len(collection) - 1
+
+    sorted = False
+    while not sorted:
+        if stats is not None:
+            stats.passes += 1
+        sorted = True
+        for position in range(start, end):
+            if collection[position + 1] < collection[position]:
+                collection[position + 1], collection[position] = collection[position], collection[position + 1]
+                sorted = False
+                end = position
+        if not sorted:
+            if stats is not None:
+                stats.passes += 1
+            sorted = True
+            for position in range(end, start, -1):
+                if collection[position] < collection[position - 1]:
+                    collection[position], collection[position - 1] = collection[position - 1], collection[position]
+                    sorted = False
+                    start = position
+
+def insertion_sort(collection, compare_func=None, key=None, stats=None):
+    """Insertion sort implementation
+
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+
+        Insertion sort iterates, consuming one input element each repetition, and
+        growing a sorted output list. On a repetition, insertion sort removes one
+        element from the input data, finds the location it belongs within the sorted
+        list, and inserts it there. It repeats until no input elements remain.
+        Worst case perfomance - O(n^2) comparisons, swaps
+        Best case perfomance - O(n) comparisons, O(1) swaps
+        Average case perfomance - O(n^2) comparisons, swaps
+        Worst case space complexity - O(n) total, O(1) auxiary
+        (http://en.wikipedia.org/wiki/Insertion_sort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    _sort_by_key(collection, compare_func, key, stats, _insertion_sort, stable=True)
+
+def _insertion_sort(collection, stats=None):
+    if stats is not None:
+        stats.passes += 1
+    for index_to_rearange in range(1, len(collection)):
+        if collection[index_to_rearange] < collection[index_to_rearange - 1]:
+            value_to_rearange = collection[index_to_rearange]
+            hole_index = index_to_rearange
+            while hole_index > 0 and value_to_rearange < collection[hole_index - 1]:
+                collection[hole_index] = collection[hole_index - 1]
+                hole_index -= 1
+            collection[hole_index] = value_to_rearange
+
+def _shell_gap_sequence(collection_length):
+    if collection_length > 0:
+        gap, k = None, 0
+        while gap != 1:
+            gap = collection_length // 2 ** k
+            yield gap
+            k += 1
+
+def _frank_lazarus_gap_sequence(collection_length):
+    if collection_length > 0:
+        gap, k = None, 1
+        while gap != 1:
+            gap = 2 * (collection_length >> (k + 1)) + 1
+            yield gap
+            k += 1
+
+def _gonnet_baeza_yatez_gap_sequence(collection_length):
+    if collection_length > 0:
+        gap = collection_length
+        while gap != 1:
+            gap = max(5 * gap // 11, 1)
+            yield gap
+
+def _hibbard_gaps(limit):
+    gap = 1
+    while gap < limit:
+        yield gap
+        gap = gap * 2 + 1
+
+def _papernov_stasevich_gaps(limit):
+    gap, k = 1, 1
+    while gap < limit:
+        yield gap
+        gap = 2 ** k + 1
+        k += 1
+
+def _pratt_gaps(limit):
+    gaps = []
+    power_of_two = 1
+    while power_of_two < limit:
+        gap = power_of_two
+        while gap < limit:
+            gaps.append(gap)
+            gap *= 3
+        power_of_two *= 2
+    return sorted(gaps)
+
+def _knuth_gaps(limit):
+    gap = 1
+    while gap < limit:
+        yield gap
+        gap = gap * 3 + 1
+
+def _incerpi_sedgewick_gaps(limit):
+    # h(k) is the product of a(q) for q < r except q = (r^2 + r) / 2 - k, where
+    # r = floor(sqrt(2k + sqrt(2k))) and a(q) is the smallest integer not less than
+    # 2.5^(q+1) which is coprime with all of a(p), p < q
+    factors = []
+    k = 1
+    while True:
+        r = int(sqrt(2 * k + sqrt(2 * k)))
+        while len(factors) < r:
+            factor = int(ceil(2.5 ** (len(factors) + 1)))
+            while any(_gcd(factor, previous) != 1 for previous in factors):
+                factor += 1
+            factors.append(factor)
+
+        excluded = (r * r + r) // 2 - k
+        gap = 1
+        for q in range(r):
+            if q != excluded:
+                gap *= factors[q]
+        if gap >= limit:
+            return
+        yield gap
+        k += 1
+
+def _sedgewick_gaps(limit):
+    gap, k = 1, 1
+    while gap < limit:
+        yield gap
+        gap = 4 ** k + 3 * 2 ** (k - 1) + 1
+        k += 1
+
+def _sedgewick2_gaps(limit):
+    gap, k = 1, 1
+    while gap < limit:
+        yield gap
+        if k % 2 == 0:
+            gap = 9 * (2 ** k - 2 ** (k // 2)) + 1
+        else:
+            gap = 8 * 2 ** k - 6 * 2 ** ((k + 1) // 2) + 1
+        k += 1
+
+def _tokuda_gaps(limit):
+    gap, k = 1, 2
+    while gap < limit:
+        yield gap
+        gap = -(-(9 ** k - 4 ** k) // (5 * 4 ** (k - 1)))
+        k += 1
+
+_CUIRA_GAPS = (1, 4, 10, 23, 57, 132, 301, 701)
+
+def _cuira_gaps(limit):
+    for gap in _CUIRA_GAPS:
+        if gap >= limit:
+            return
+        yield gap
+
+    # empirical sequence ends at 701, it's extended by the usual h(k) = 2.25 * h(k - 1)
+    gap = int(_CUIRA_GAPS[-1] * 2.25)
+    while gap < limit:
+        yield gap
+        gap = int(gap * 2.25)
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+# gap sequences depending on the collection length, generate gaps in decreasing order
+_LENGTH_GAP_SEQUENCES = {
+    'shell': _shell_gap_sequence,
+    'frank_lazarus': _frank_lazarus_gap_sequence,
+    'gonnet_baeza_yatez': _gonnet_baeza_yatez_gap_sequence,
+}
+
+# gap sequences independent from the collection length, generate gaps less than limit
+# in increasing order
+_GAP_SEQUENCES = {
+    'hibbard': _hibbard_gaps,
+    'papernov_stasevich': _papernov_stasevich_gaps,
+    'pratt': _pratt_gaps,
+    'knuth': _knuth_gaps,
+    'incerpi_sedgewick': _incerpi_sedgewick_gaps,
+    'sedgewick': _sedgewick_gaps,
+    'sedgewick2': _sedgewick2_gaps,
+    'tokuda': _tokuda_gaps,
+    'cuira': _cuira_gaps,
+}
+
+_gap_sequences_cache = {}
+
+def _gap_sequence(method, collection_length):
+    """Gaps of length independent sequence less than collection_length in decreasing order
+
+        Gaps are generated up to the next power of 2 after collection_length and
+        memoized per (method, power of 2), so sorts of lists of similar length share
+        the sequence."""
+    bucket = 1 << collection_length.bit_length()
+    gaps = _gap_sequences_cache.get((method, bucket))
+    if gaps is None:
+        gaps = list(_GAP_SEQUENCES[method](bucket))
+        gaps.reverse()
+        _gap_sequences_cache[(method, bucket)] = gaps
+
+    first = 0
+    while first < len(gaps) and gaps[first] >= collection_length:
+        first += 1
+    return gaps[first:]
+
+def shell_sort(collection, compare_func=None, gap_sequence=None, key=None, stats=None):
+    """Shell sort implementation
+
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+        gap_sequence - gap sequence method. One of:
+            shell - N/2^k, worst-case time complexity - O(N^2), when N=2^p
+            frank_lazarus - 2(N/2^(k+1))+1, worst-case time complexity - O(N^(3/2))
+            hibbard - 2^k-1, worst-case time complexity - O(N^(3/2))
+            papernov_stasevich - 2^k+1, worst-case time complexity - O(N^(3/2))
+            pratt - 2^p*3^q, worst-case time complexity - O(N*(log^2(N)))
+            knuth - (3^k-1)/2, worst-case time complexity - O(N^(3/2))
+            incerpi_sedgewick - product of a(q), q < r, q != (r^2+r)/2-k,
+                r = sqrt(2k+sqrt(2k)), a(q) - smallest integer >= 2.5^(q+1)
+                coprime with a(p), p < q, worst-case time complexity -
+                O(N^(1+sqrt(8ln(5/2)/ln(N))))
+            sedgewick - 4^k+3*2^(k-1)+1, worst-case time complexity - O(N^(4/3))
+            sedgewick2 - 9*(4^(k-1)-2^(k-1)) + 1.4^(k+1)-6*2^k+1, worst-case time
+                complexity - O(N^(4/3))
+            gonnet_baeza_yatez - max(5h(k-1)/11, 1), h(0) = N,
+            tokuda - (9^k-4^k)/(5*4^(k-1)),
+            cuira - [701, 301, 132, 57, 23, 10, 4, 1], extended with
+                h(k) = 2.25h(k-1) for N > 701
+        by default cuira gap sequence is used as it is most effective in practice.
+        Length independent sequences are generated up to the collection length and
+        memoized, so repeated sorts don't regenerate them
+
+        Shellsort is a multi-pass algorithm. Each pass is an insertion sort of the
+            sequences consisting of every h-th element for a fixed gap h (also known
+            as the increment). This is referred to as h-sorting.
+        Worst-case space complexity O(n) total, O(1) auxilary
+        (http://en.wikipedia.org/wiki/Shellsort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    if gap_sequence is None:
+        gap_sequence = 'cuira'
+
+    collection_len = len(collection)
+
+    if gap_sequence in _GAP_SEQUENCES:
+        gaps = _gap_sequence(gap_sequence, collection_len)
+    elif gap_sequence in _LENGTH_GAP_SEQUENCES:
+        gaps = _LENGTH_GAP_SEQUENCES[gap_sequence](collection_len)
+    else:
+        raise ValueError('Invaid gap sequence method')
+
+    _sort_by_key(collection, compare_func, key, stats, _shell_sort, gaps)
+
+def _shell_sort(collection, gaps, stats=None):
+    collection_len = len(collection)
+    for gap in gaps:
+        if stats is not None:
+            stats.passes += 1
+        for sub_sequence_start in range(0, gap):
+            for index_to_rearange in range(sub_sequence_start + gap, collection_len, gap):
+                if collection[index_to_rearange] < collection[index_to_rearange - gap]:
+                    value_to_rearange = collection[index_to_rearange]
+                    hole_index = index_to_rearange
+                    while hole_index > sub_sequence_start and value_to_rearange < collection[hole_index - gap]:
+                        collection[hole_index] = collection[hole_index - gap]
+                        hole_index -= gap
+                    collection[hole_index] = value_to_rearange
+
+def comb_sort(collection, compare_func=None, key=None, stats=None):
+    """Comb sort implementation
+
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+
+        Comb sort improves on bubble sort. In bubble sort, when any two elements
+        are compared, they always have a gap (distance from each other) of 1.
+        The basic idea of comb sort is that the gap can be much more than 1.
+        The gap starts out as the length of the list being sorted divided by
+        the shrink factor (generally 1.3), and the list is sorted with that value
+        (rounded down to an integer if needed) as the gap. Then the gap is divided
+        by the shrink factor again, the list is sorted with this new gap, and the
+        process repeats until the gap is 1. At this point, comb sort continues
+        using a gap of 1 until the list is fully sorted. The final stage of the
+        sort is thus equivalent to a bubble sort, but by this time most turtles
+        have been dealt with, so a bubble sort will be efficient.
+        (http://en.wikipedia.org/wiki/Comb_sort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    _sort_by_key(collection, compare_func, key, stats, _comb_sort)
+
+def _comb_sort(collection, stats=None):
+    collection_len = len(collection)
+    gap = collection_len
+    shrink_factor = 1.3
+    sorted = False
+
+    while not sorted or gap != 1:
+        if stats is not None:
+            stats.passes += 1
+        sorted = True
+        gap = int(gap / shrink_factor)
+        if gap < 1:
+            gap = 1
+
+        for sub_sequence_start in range(0, gap):
+            for position in range(sub_sequence_start + gap, collection_len, gap):
+                if collection[position] < collection[position - gap]:
+                    collection[position], collection[position - gap] = collection[position - gap], collection[position]
+                    sorted = False
+
+def _merge(collection, buffer, left_seq, right_seq, compare_func=None):
+    """Merge 2 sub-sequences from collection specified by left_seq and right_seq and put them to the buffer
+        list at the same positions.
+
+        left_seq and right_seq are tuples like (from, to)
+        collection - list of sub-sequences
+        buffer - list to be populated by merge result
+        compare_func - function to compare items at the begining of sub-sequences,
+            items are compared with < if it's None
+
+        Merge is done by getting the first elements of both sub-sequences, compare them with compare_func and
+        produce new sequence with less elements. Thereby if sub-sequences are sorted then produced by merge list
+        will also be sorted.
+        Used by merge sort algorithm."""
+
+    left_from, left_to = left_seq[0], left_seq[1]
+    right_from, right_to = right_seq[0], right_seq[1]
+
+    if not isinstance(collection, list) or not isinstance(buffer, list):
+        raise TypeError('collection and buffer must be an instances of list')
+
+    if not isinstance(left_seq, tuple) or not isinstance(right_seq, tuple):
+        raise TypeError('left_seq and right_seq must be an instances of tuple')
+
+    if left_from < 0 or right_from < 0 or left_to >= len(collection) or right_to >= len(collection):
+        raise ValueError('sub-sequences must be inside of collection')
+
+    if right_from - left_to != 1:
+        raise ValueError('right_seq must be right after left_seq')
+
+    if left_to < left_from or right_to < right_from:
+        raise ValueError('Invalid sub-sequences')
+
+    if len(collection) != len(buffer):
+        raise ValueError('both colleciton and buffer must me the same length')
+
+    if compare_func is None:
+        _merge_unchecked(collection, buffer, left_from, left_to, right_to)
+        return
+
+    for i in range(left_from, right_to + 1):
+        next_item = None
+        if left_from > left_to:
+            next_item = right_from
+            right_from += 1
+        elif right_from > right_to:
+            next_item = left_from
+            left_from += 1
+
+        if next_item is None:
+            if compare_func(collection[right_from], collection[left_from]) < 0:
+                next_item = right_from
+                right_from += 1
+            else:
+                next_item = left_from
+                left_from += 1
+
+        buffer[i] = collection[next_item]
+
+def _merge_unchecked(collection, buffer, left_from, left_to, right_to):
+    """Merge collection[left_from:left_to + 1] and collection[left_to + 1:right_to + 1]
+        to the same positions of buffer comparing items with <. Arguments are not
+        validated, both sub-sequences must be non-empty. The rest of a sub-sequence is
+        copied with a single slice as soon as the other one is exhausted"""
+    right_from = left_to + 1
+    i = left_from
+    left_item = collection[left_from]
+    right_item = collection[right_from]
+    while True:
+        if right_item < left_item:
+            buffer[i] = right_item
+            i += 1
+            right_from += 1
+            if right_from > right_to:
+                buffer[i:right_to + 1] = collection[left_from:left_to + 1]
+                return
+            right_item = collection[right_from]
+        else:
+            buffer[i] = left_item
+            i += 1
+            left_from += 1
+            if left_from > left_to:
+                buffer[i:right_to + 1] = collection[right_from:right_to + 1]
+                return
+            left_item = collection[left_from]
+
+def _get_sorted_sequences(collection, compare_func=None):
+    """Sorted sub-sequences generator
+
+        Find sorted sub-sequences on collection and generates a tuples with positions
+        of sub-sequences in (from, to) format. Items are compared with compare_func
+        or with < if it's None"""
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    collection_len = len(collection)
+    if collection_len > 0:
+        seq_start = 0
+        for i in range(1, collection_len):
+            if compare_func is None:
+                is_descent = collection[i] < collection[i - 1]
+            else:
+                is_descent = compare_func(collection[i], collection[i - 1]) < 0
+            if is_descent:
+                yield (seq_start, i - 1)
+                seq_start = i
+        yield (seq_start, collection_len - 1)
+
+def merge_sort(collection, compare_func=None, key=None, stats=None, low_memory=False, unique=False, reduce=None):
+    """Natutal merge sort implementation
+
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+        low_memory - merge sub-lists in place instead of using a buffer as long as
+            collection. Only a copy of the shorter of two merged sub-lists is made
+        unique - keep only the first of items with equal keys
+        reduce - function combining two items with equal keys into one.
+            reduce(a, b) -> item, a is the earlier item. The result must have the same
+            key. Mutually exclusive with unique, both don't support low_memory
+
+        Algorithm is done by divide the unsorted list into N sorted subslists, and
+        then repeatedly merge them to produce new sorted sublists until only 1
+        sublist remaining. This will be the sorted list.
+        By default the sublists are merged with the run stack and galloping merges
+        of tim_sort, so nearly sorted lists are merged in close to a single pass.
+        With low_memory they are merged pairwise in place pass by pass.
+        With unique or reduce items with equal keys are combined as soon as they
+        meet, either in a sorted sublist or in a merge, so every merge pass
+        processes at most one item per key.
+        Worst case performance - O(n log n)
+        Best case performance - O(n)
+        Average case performance - O(n log n)
+        Worst case space complexity - O(n) auxilary, n/2 items with low_memory.
+            key and compare_func need O(n) more for decorated items in both modes
+        (http://en.wikipedia.org/wiki/Merge_sort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    if unique or reduce is not None:
+        if unique and reduce is not None:
+            raise ValueError('unique and reduce are mutually exclusive')
+        if low_memory:
+            raise ValueError('low_memory is not supported with unique and reduce')
+        _merge_sort_reduce(collection, compare_func, key, stats, reduce or _keep_first)
+        return
+
+    _sort_by_key(collection, compare_func, key, stats, _merge_sort_low_memory if low_memory else _tim_sort, stable=True)
+
+def _merge_sort_low_memory(collection, stats=None):
+    # sub-sequences generator compares items after the yielded sub-sequence only,
+    # so the sub-sequences can be merged in place while it's running
+    is_sorted = False
+    while not is_sorted:
+        if stats is not None:
+            stats.passes += 1
+        first_seq = None
+        sequences_count = 0
+        for seq in _get_sorted_sequences(collection):
+            if first_seq is None:
+                first_seq = seq
+            else:
+                _merge_adjacent(collection, first_seq[0], first_seq[1] - first_seq[0] + 1,
+                    seq[0], seq[1] - seq[0] + 1, _MIN_GALLOP)
+                if stats is not None:
+                    stats.merges += 1
+                first_seq = None
+
+            sequences_count += 1
+
+        is_sorted = sequences_count <= 2
+
+def _keep_first(a, b):
+    return a
+
+def _merge_reduce(left, right, reduce):
+    """Merge sorted lists of (key, item) entries with unique keys into a new list,
+        entries with equal keys are combined with reduce. Only < is used for keys"""
+    merged = []
+    append = merged.append
+    left_index, right_index = 0, 0
+    left_len, right_len = len(left), len(right)
+    left_entry, right_entry = left[0], right[0]
+    left_key, right_key = left_entry[0], right_entry[0]
+    while True:
+        if right_key < left_key:
+            append(right_entry)
+            right_index += 1
+            if right_index == right_len:
+                break
+            right_entry = right[right_index]
+            right_key = right_entry[0]
+        elif left_key < right_key:
+            append(left_entry)
+            left_index += 1
+            if left_index == left_len:
+                merged.extend(right[right_index:])
+                return merged
+            left_entry = left[left_index]
+            left_key = left_entry[0]
+        else:
+            # keys of a list are unique, so the combined entry is less than the
+            # next right one
+            left_entry = (left_key, reduce(left_entry[1], right_entry[1]))
+            right_index += 1
+            if right_index == right_len:
+                break
+            right_entry = right[right_index]
+            right_key = right_entry[0]
+
+    append(left_entry)
+    merged.extend(left[left_index + 1:])
+    return merged
+
+def _merge_sort_reduce(collection, compare_func, key, stats, reduce):
+    """Natural merge sort of (key, item) entries combining items with equal keys.
+        Sorted sub-sequences become lists with unique keys, which are merged
+        pairwise with _merge_reduce until a single list remains"""
+
+    if compare_func is not None and key is not None:
+        raise ValueError('compare_func and key are mutually exclusive')
+
+    started = time()
+    if key is not None:
+        keys = [key(item) for item in collection]
+    elif compare_func is not None:
+        keys = [cmp_to_key(compare_func)(item) for item in collection]
+    else:
+        keys = collection
+    if stats is not None:
+        keys = [_CountedItem(stats, item_key, None) for item_key in keys]
+        stats.add_phase('decorate', time() - started)
+
+    started = time()
+    runs = []
+    run = previous = None
+    for entry in zip(keys, collection):
+        if run is not None and not entry[0] < previous[0]:
+            if previous[0] < entry[0]:
+                run.append(entry)
+                previous = entry
+            else:
+                previous = run[-1] = (previous[0], reduce(previous[1], entry[1]))
+            continue
+        run = [entry]
+        runs.append(run)
+        previous = entry
+    del keys
+
+    if stats is not None:
+        stats.passes += 1
+    while len(runs) > 1:
+        merged_runs = [_merge_reduce(runs[index], runs[index + 1], reduce) for index in range(0, len(runs) - 1, 2)]
+        if stats is not None:
+            stats.passes += 1
+            stats.merges += len(merged_runs)
+            stats.moves += sum(len(run) for run in merged_runs)
+        if len(runs) % 2:
+            merged_runs.append(runs[-1])
+        runs = merged_runs
+    if stats is not None:
+        stats.add_phase('sort', time() - started)
+
+    started = time()
+    collection[:] = [item for _, item in runs[0]] if runs else []
+    if stats is not None:
+        stats.add_phase('undecorate', time() - started)
+
+_BLOCK_SIZE = 32
+
+def bottom_up_merge_sort(collection, compare_func=None, key=None, stats=None):
+    """Bottom-up merge sort implementation
+
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+
+        Blocks of 32 items are sorted with binary insertion, then blocks are merged
+        pairwise with widths doubling every pass. Unlike natural merge sort it doesn't
+        start from runs of 1-2 items on random data, so it makes 5 passes less.
+        Adjacent blocks already in order are copied without merging.
+        Worst case performance - O(n log n)
+        Best case performance - O(n)
+        Average case performance - O(n log n)
+        Worst case space complexity - O(n) auxilary
+        (http://en.wikipedia.org/wiki/Merge_sort#Bottom-up_implementation)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    _sort_by_key(collection, compare_func, key, stats, _bottom_up_merge_sort, stable=True)
+
+def _bottom_up_merge_sort(collection, stats=None):
+    collection_len = len(collection)
+    for block_from in range(0, collection_len, _BLOCK_SIZE):
+        _binary_insertion_sort(collection, block_from, min(block_from + _BLOCK_SIZE, collection_len), block_from + 1)
+    if stats is not None:
+        stats.passes += 1
+
+    work = collection
+    buffer = None
+    width = _BLOCK_SIZE
+    while width < collection_len:
+        if buffer is None:
+            buffer = [None] * collection_len
+            if stats is not None:
+                buffer = _CountingList(stats, buffer)
+        if stats is not None:
+            stats.passes += 1
+
+        for left_from in range(0, collection_len, 2 * width):
+            right_from = left_from + width
+            if right_from >= collection_len:
+                buffer[left_from:] = work[left_from:]
+                continue
+
+            right_to = min(right_from + width, collection_len) - 1
+            if work[right_from] < work[right_from - 1]:
+                _merge_unchecked(work, buffer, left_from, right_from - 1, right_to)
+                if stats is not None:
+                    stats.merges += 1
+            else:
+                buffer[left_from:right_to + 1] = work[left_from:right_to + 1]
+
+        work, buffer = buffer, work
+        width *= 2
+
+    if work is not collection:
+        collection[:] = work
+
+_PARALLEL_THRESHOLD = 100000
+
+def _sort_chunk(task):
+    """Sort chunk in a worker process. task is (chunk, compare_func, with_stats)
+        tuple, (chunk, stats) tuple is returned, stats is None without with_stats"""
+    chunk, compare_func, with_stats = task
+    stats = SortStats() if with_stats else None
+    merge_sort(chunk, compare_func, stats=stats)
+    return chunk, stats
+
+def parallel_merge_sort(collection, compare_func=None, key=None, workers=None, threshold=_PARALLEL_THRESHOLD,
+        stats=None):
+    """Parallel merge sort implementation
+
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+            Must be picklable, i.e. defined at module level
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func. Keys are computed in the calling
+            process, so only keys must be picklable
+        workers - number of worker processes, number of CPUs by default
+        threshold - collections shorter than threshold are sorted with merge_sort
+            in the calling process, as sending them to workers costs more than sorting
+        stats - SortStats instance to collect counters and timings to, if any.
+            Counters of the workers are added to it, time spent in the pool is
+            reported as chunks phase
+
+        The list is split into one chunk per worker, chunks are sorted with merge sort
+        in a process pool and put back. Sorted chunks are natural runs of the
+        collection, so the final merge_sort only merges them, galloping over the
+        long stretches taken from one chunk. With key the workers sort (key, position) pairs and
+        the items are rearranged by positions at the end, so items never leave the
+        calling process. The sort is stable.
+        Worst case performance - O(n log n)
+        Worst case space complexity - O(n) auxilary"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    if compare_func is not None and key is not None:
+        raise ValueError('compare_func and key are mutually exclusive')
+
+    if workers is None:
+        workers = cpu_count() or 1
+
+    collection_len = len(collection)
+    if workers < 2 or collection_len < max(threshold, 2):
+        merge_sort(collection, compare_func, key, stats)
+        return
+
+    from multiprocessing import Pool
+
+    started = time()
+    if key is not None:
+        work = [(key(item), position) for position, item in enumerate(collection)]
+    else:
+        work = collection
+    if stats is not None:
+        stats.add_phase('decorate', time() - started)
+
+    started = time()
+    chunk_len = (collection_len + workers - 1) // workers
+    tasks = [(work[chunk_from:chunk_from + chunk_len], compare_func, stats is not None)
+        for chunk_from in range(0, collection_len, chunk_len)]
+
+    # the pool is terminated on exit, its workers are idle once map returns
+    with Pool(workers) as pool:
+        chunks = pool.map(_sort_chunk, tasks)
+    del tasks
+
+    for chunk_from, (chunk, chunk_stats) in zip(range(0, collection_len, chunk_len), chunks):
+        work[chunk_from:chunk_from + chunk_len] = chunk
+        if chunk_stats is not None:
+            stats.comparisons += chunk_stats.comparisons
+            stats.moves += chunk_stats.moves
+            stats.passes += chunk_stats.passes
+            stats.merges += chunk_stats.merges
+    del chunks
+    if stats is not None:
+        stats.add_phase('chunks', time() - started)
+
+    merge_sort(work, compare_func, stats=stats)
+
+    if key is not None:
+        started = time()
+        collection[:] = [collection[position] for _, position in work]
+        if stats is not None:
+            stats.add_phase('undecorate', time() - started)
+
+_MIN_MERGE = 64
+_MIN_GALLOP = 7
+
+def _min_run_length(collection_len):
+    """Minimal run length for tim sort
+
+        Take the 6 most significant bits of collection_len and add 1 if any of the
+        remaining bits is set, so collection_len / min_run is equal to or slightly
+        less than a power of 2 and the final merges are balanced."""
+    remainder = 0
+    while collection_len >= _MIN_MERGE:
+        remainder |= collection_len & 1
+        collection_len >>= 1
+    return collection_len + remainder
+
+def _count_run(collection, run_from, collection_len):
+    """Find the length of the run starting at run_from. Strictly descending runs are
+        reversed in place, so the returned run is always ascending. Runs of equal items
+        are never treated as descending to keep the sort stable."""
+    run_to = run_from + 1
+    if run_to == collection_len:
+        return 1
+
+    if collection[run_to] < collection[run_from]:
+        run_to += 1
+        while run_to < collection_len and collection[run_to] < collection[run_to - 1]:
+            run_to += 1
+        collection[run_from:run_to] = collection[run_from:run_to][::-1]
+    else:
+        run_to += 1
+        while run_to < collection_len and not collection[run_to] < collection[run_to - 1]:
+            run_to += 1
+
+    return run_to - run_from
+
+def _binary_insertion_sort(collection, sort_from, sort_to, sorted_to):
+    """Sort collection[sort_from:sort_to] with binary insertion, items from sort_from
+        up to sorted_to must be already sorted"""
+    for position in range(sorted_to, sort_to):
+        value_to_rearange = collection[position]
+        hole_index = bisect_right(collection, value_to_rearange, sort_from, position)
+        if hole_index != position:
+            collection[hole_index + 1:position + 1] = collection[hole_index:position]
+            collection[hole_index] = value_to_rearange
+
+def _merge_lo(collection, left_from, left_len, right_from, right_len, min_gallop):
+    """Merge adjacent runs in place using temporary copy of the left run. Should be
+        used when left run is not longer than the right one. Returns new min_gallop."""
+    tmp = collection[left_from:left_from + left_len]
+    left, left_to = 0, left_len
+    right, right_to = right_from, right_from + right_len
+    dest = left_from
+
+    while left < left_to and right < right_to:
+        # one pair at a time until one run wins min_gallop times in a row
+        left_wins = right_wins = 0
+        while left < left_to and right < right_to:
+            if collection[right] < tmp[left]:
+                collection[dest] = collection[right]
+                right += 1
+                right_wins += 1
+                left_wins = 0
+            else:
+                collection[dest] = tmp[left]
+                left += 1
+                left_wins += 1
+                right_wins = 0
+            dest += 1
+            if left_wins >= min_gallop or right_wins >= min_gallop:
+                break
+
+        # galloping mode, copy whole slices while runs keep winning
+        while left < left_to and right < right_to:
+            left_wins = bisect_right(tmp, collection[right], left, left_to) - left
+            if left_wins:
+                collection[dest:dest + left_wins] = tmp[left:left + left_wins]
+                dest += left_wins
+                left += left_wins
+                if left == left_to:
+                    break
+
+            right_wins = bisect_left(collection, tmp[left], right, right_to) - right
+            collection[dest:dest + right_wins] = collection[right:right + right_wins]
+            dest += right_wins
+            right += right_wins
+
+            min_gallop = max(min_gallop - 1, 1)
+            if left_wins < _MIN_GALLOP and right_wins < _MIN_GALLOP:
+                min_gallop += 2
+                break
+
+    if left < left_to:
+        collection[dest:dest + left_to - left] = tmp[left:left_to]
+
+    return min_gallop
+
+def _merge_hi(collection, left_from, left_len, right_from, right_len, min_gallop):
+    """Merge adjacent runs in place using temporary copy of the right run. Should be
+        used when right run is shorter than the left one. Returns new min_gallop."""
+    tmp = collection[right_from:right_from + right_len]
+    left = right_from - 1
+    right = right_len - 1
+    dest = right_from + right_len - 1
+
+    while left >= left_from and right >= 0:
+        # one pair at a time from the end until one run wins min_gallop times in a row
+        left_wins = right_wins = 0
+        while left >= left_from and right >= 0:
+            if tmp[right] < collection[left]:
+                collection[dest] = collection[left]
+                left -= 1
+                left_wins += 1
+                right_wins = 0
+            else:
+                collection[dest] = tmp[right]
+                right -= 1
+                right_wins += 1
+                left_wins = 0
+            dest -= 1
+            if left_wins >= min_gallop or right_wins >= min_gallop:
+                break
+
+        # galloping mode, copy whole slices while runs keep winning
+        while left >= left_from and right >= 0:
+            left_wins = left + 1 - bisect_right(collection, tmp[right], left_from, left + 1)
+            if left_wins:
+                collection[dest - left_wins + 1:dest + 1] = collection[left - left_wins + 1:left + 1]
+                dest -= left_wins
+                left -= left_wins
+                if left < left_from:
+                    break
+
+            right_wins = right + 1 - bisect_left(tmp, collection[left], 0, right + 1)
+            collection[dest - right_wins + 1:dest + 1] = tmp[right - right_wins + 1:right + 1]
+            dest -= right_wins
+            right -= right_wins
+
+            min_gallop = max(min_gallop - 1, 1)
+            if left_wins < _MIN_GALLOP and right_wins < _MIN_GALLOP:
+                min_gallop += 2
+                break
+
+    if right >= 0:
+        collection[dest - right:dest + 1] = tmp[0:right + 1]
+
+    return min_gallop
+
+def _merge_at(collection, runs, index, min_gallop):
+    """Merge runs[index] and runs[index + 1] in place and replace them on the runs stack.
+        Returns new min_gallop."""
+    left_from, left_len = runs[index]
+    right_from, right_len = runs[index + 1]
+    runs[index] = (left_from, left_len + right_len)
+    del runs[index + 1]
+    return _merge_adjacent(collection, left_from, left_len, right_from, right_len, min_gallop)
+
+def _merge_adjacent(collection, left_from, left_len, right_from, right_len, min_gallop):
+    """Merge adjacent runs in place using temporary copy of the shorter one.
+        Returns new min_gallop."""
+    # items of the left run not greater than the first item of the right run and items
+    # of the right run not less than the last item of the left run are already in place
+    start = bisect_right(collection, collection[right_from], left_from, right_from)
+    left_len -= start - left_from
+    left_from = start
+    if left_len == 0:
+        return min_gallop
+
+    right_len = bisect_left(collection, collection[right_from - 1], right_from, right_from + right_len) - right_from
+    if right_len == 0:
+        return min_gallop
+
+    if left_len <= right_len:
+        return _merge_lo(collection, left_from, left_len, right_from, right_len, min_gallop)
+    else:
+        return _merge_hi(collection, left_from, left_len, right_from, right_len, min_gallop)
+
+def _merge_collapse(collection, runs, min_gallop):
+    """Merge runs on the stack until invariants are restored:
+        runs[-3] > runs[-2] + runs[-1] and runs[-2] > runs[-1] (by length).
+        Returns new min_gallop."""
+    while len(runs) > 1:
+        index = len(runs) - 2
+        if (index > 0 and runs[index - 1][1] <= runs[index][1] + runs[index + 1][1]) or \
+                (index > 1 and runs[index - 2][1] <= runs[index - 1][1] + runs[index][1]):
+            if runs[index - 1][1] < runs[index + 1][1]:
+                index -= 1
+        elif runs[index][1] > runs[index + 1][1]:
+            break
+        min_gallop = _merge_at(collection, runs, index, min_gallop)
+    return min_gallop
+
+def tim_sort(collection, compare_func=None, key=None, stats=None):
+    """Tim sort implementation
+
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+
+        Run-aware stable merge sort. The list is scanned once for natural runs,
+        strictly descending runs are reversed and short runs are extended to a
+        minimal length with binary insertion sort. Runs are pushed to a stack and
+        merged as soon as the stack lengths stop decreasing fast enough, which keeps
+        merges balanced. When one run keeps winning during a merge, the merge switches
+        to galloping mode and copies whole slices found by binary search, so
+        presorted input is sorted in close to a single pass.
+        Worst case performance - O(n log n)
+        Best case performance - O(n)
+        Average case performance - O(n log n)
+        Worst case space complexity - O(n) auxilary
+        (http://en.wikipedia.org/wiki/Timsort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    _sort_by_key(collection, compare_func, key, stats, _tim_sort, stable=True)
+
+def _tim_sort(collection, stats=None):
+    collection_len = len(collection)
+    if collection_len < 2:
+        return
+
+    if stats is not None:
+        # every run but the first one is merged once
+        stats.passes += 1
+        stats.merges -= 1
+
+    min_run = _min_run_length(collection_len)
+    min_gallop = _MIN_GALLOP
+    runs = []
+    run_from = 0
+    while run_from < collection_len:
+        run_len = _count_run(collection, run_from, collection_len)
+        if run_len < min_run:
+            forced_len = min(min_run, collection_len - run_from)
+            _binary_insertion_sort(collection, run_from, run_from + forced_len, run_from + run_len)
+            run_len = forced_len
+
+        runs.append((run_from, run_len))
+        if stats is not None:
+            stats.merges += 1
+        min_gallop = _merge_collapse(collection, runs, min_gallop)
+        run_from += run_len
+
+    while len(runs) > 1:
+        index = len(runs) - 2
+        if index > 0 and runs[index - 1][1] < runs[index + 1][1]:
+            index -= 1
+        min_gallop = _merge_at(collection, runs, index, min_gallop)
+
+_INTRO_INSERTION_THRESHOLD = 16
+_NINTHER_THRESHOLD = 128
+
+def _median(a, b, c):
+    if b < a:
+        a, b = b, a
+    if c < b:
+        b = a if c < a else c
+    return b
+
+def _choose_pivot(collection, sort_from, sort_to):
+    """Median of three for short ranges and ninther, median of three medians of
+        three, for ranges longer than _NINTHER_THRESHOLD"""
+    middle = (sort_from + sort_to) // 2
+    last = sort_to - 1
+    if sort_to - sort_from <= _NINTHER_THRESHOLD:
+        return _median(collection[sort_from], collection[middle], collection[last])
+
+    step = (sort_to - sort_from) // 8
+    return _median(
+        _median(collection[sort_from], collection[sort_from + step], collection[sort_from + 2 * step]),
+        _median(collection[middle - step], collection[middle], collection[middle + step]),
+        _median(collection[last - 2 * step], collection[last - step], collection[last]))
+
+def _partition(collection, sort_from, sort_to, pivot):
+    """Three-way partition of collection[sort_from:sort_to] around pivot value
+
+        Returns (less_to, greater_from) tuple, items before less_to are less than
+        pivot, items from greater_from are greater than pivot and items between them
+        are equal to pivot, so runs of equal items are never partitioned again."""
+    less_to, position, greater_from = sort_from, sort_from, sort_to
+    while position < greater_from:
+        item = collection[position]
+        if item < pivot:
+            collection[position] = collection[less_to]
+            collection[less_to] = item
+            less_to += 1
+            position += 1
+        elif pivot < item:
+            greater_from -= 1
+            collection[position] = collection[greater_from]
+            collection[greater_from] = item
+        else:
+            position += 1
+    return less_to, greater_from
+
+def _sift_down(collection, offset, root, heap_len):
+    item = collection[offset + root]
+    child = 2 * root + 1
+    while child < heap_len:
+        if child + 1 < heap_len and collection[offset + child] < collection[offset + child + 1]:
+            child += 1
+        if not item < collection[offset + child]:
+            break
+        collection[offset + root] = collection[offset + child]
+        root = child
+        child = 2 * root + 1
+    collection[offset + root] = item
+
+def _heap_sort(collection, sort_from, sort_to):
+    """Sort collection[sort_from:sort_to] in place with heap sort"""
+    heap_len = sort_to - sort_from
+    for root in range(heap_len // 2 - 1, -1, -1):
+        _sift_down(collection, sort_from, root, heap_len)
+    for heap_len in range(heap_len - 1, 0, -1):
+        collection[sort_from], collection[sort_from + heap_len] = \
+            collection[sort_from + heap_len], collection[sort_from]
+        _sift_down(collection, sort_from, 0, heap_len)
+
+def intro_sort(collection, compare_func=None, key=None, stats=None):
+    """Introsort implementation
+
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+
+        Quicksort with median of three pivot for short ranges and ninther for long
+        ones. Partitioning is three-way, so items equal to pivot are put to their
+        final place at once and lists with many equal items are sorted in linear
+        time. Ranges up to 16 items are finished with binary insertion sort. When
+        recursion gets deeper than 2*log2(n) the range is sorted with heap sort,
+        which limits the worst case. The shorter partition is always sorted first,
+        so the stack of pending ranges holds at most log2(n) items.
+        The sort is not stable unless key or compare_func is used.
+        Worst case performance - O(n log n)
+        Best case performance - O(n)
+        Average case performance - O(n log n)
+        Worst case space complexity - O(log n) auxilary
+        (http://en.wikipedia.org/wiki/Introsort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    _sort_by_key(collection, compare_func, key, stats, _intro_sort)
+
+def _intro_sort(collection, stats=None):
+    collection_len = len(collection)
+    ranges = [(0, collection_len, 2 * collection_len.bit_length())]
+    while ranges:
+        sort_from, sort_to, depth_limit = ranges.pop()
+        while sort_to - sort_from > _INTRO_INSERTION_THRESHOLD and depth_limit > 0:
+            depth_limit -= 1
+            if stats is not None:
+                stats.passes += 1
+            less_to, greater_from = _partition(collection, sort_from, sort_to,
+                _choose_pivot(collection, sort_from, sort_to))
+            if less_to - sort_from < sort_to - greater_from:
+                ranges.append((greater_from, sort_to, depth_limit))
+                sort_to = less_to
+            else:
+                ranges.append((sort_from, less_to, depth_limit))
+                sort_from = greater_from
+
+        if sort_to - sort_from > _INTRO_INSERTION_THRESHOLD:
+            _heap_sort(collection, sort_from, sort_to)
+        elif sort_to - sort_from > 1:
+            _binary_insertion_sort(collection, sort_from, sort_to, sort_from + 1)
+
+# comparator layers of sorting networks, optimal in number of comparators
+# (http://en.wikipedia.org/wiki/Sorting_network)
+_SORTING_NETWORKS = {
+    2: [[(0, 1)]],
+    3: [[(1, 2)], [(0, 2)], [(0, 1)]],
+    4: [[(0, 2), (1, 3)], [(0, 1), (2, 3)], [(1, 2)]],
+    5: [[(0, 3), (1, 4)], [(0, 2), (1, 3)], [(0, 1), (2, 4)], [(1, 2), (3, 4)], [(2, 3)]],
+    6: [[(0, 5), (1, 3), (2, 4)], [(1, 2), (3, 4)], [(0, 3), (2, 5)], [(0, 1), (2, 3), (4, 5)], [(1, 2), (3, 4)]],
+    7: [[(0, 6), (2, 3), (4, 5)], [(0, 2), (1, 4), (3, 6)], [(0, 1), (2, 5), (3, 4)], [(1, 2), (4, 6)],
+        [(2, 3), (4, 5)], [(1, 2), (3, 4), (5, 6)]],
+    8: [[(0, 2), (1, 3), (4, 6), (5, 7)], [(0, 4), (1, 5), (2, 6), (3, 7)], [(0, 1), (2, 3), (4, 5), (6, 7)],
+        [(2, 4), (3, 5)], [(1, 4), (3, 6)], [(1, 2), (3, 4), (5, 6)]],
+    9: [[(0, 3), (1, 7), (2, 5), (4, 8)], [(0, 7), (2, 4), (3, 8), (5, 6)], [(0, 2), (1, 3), (4, 5), (7, 8)],
+        [(1, 4), (3, 6), (5, 7)], [(0, 1), (2, 4), (3, 5), (6, 8)], [(2, 3), (4, 5), (6, 7)],
+        [(1, 2), (3, 4), (5, 6)]],
+    10: [[(0, 8), (1, 9), (2, 7), (3, 5), (4, 6)], [(0, 2), (1, 4), (5, 8), (7, 9)],
+        [(0, 3), (2, 4), (5, 7), (6, 9)], [(0, 1), (3, 6), (8, 9)], [(1, 5), (2, 3), (4, 8), (6, 7)],
+        [(1, 2), (3, 5), (4, 6), (7, 8)], [(2, 3), (4, 5), (6, 7)], [(3, 4), (5, 6)]],
+    12: [[(0, 8), (1, 7), (2, 6), (3, 11), (4, 10), (5, 9)], [(0, 1), (2, 5), (3, 4), (6, 9), (7, 8), (10, 11)],
+        [(0, 2), (1, 6), (5, 10), (9, 11)], [(0, 3), (1, 2), (4, 6), (5, 7), (8, 11), (9, 10)],
+        [(1, 4), (3, 5), (6, 8), (7, 10)], [(1, 3), (2, 5), (6, 9), (8, 10)], [(2, 3), (4, 5), (6, 7), (8, 9)],
+        [(4, 6), (5, 7)], [(3, 4), (5, 6), (7, 8)]],
+    16: [[(0, 13), (1, 12), (2, 15), (3, 14), (4, 8), (5, 6), (7, 11), (9, 10)],
+        [(0, 5), (1, 7), (2, 9), (3, 4), (6, 13), (8, 14), (10, 15), (11, 12)],
+        [(0, 1), (2, 3), (4, 5), (6, 8), (7, 9), (10, 11), (12, 13), (14, 15)],
+        [(0, 2), (1, 3), (4, 10), (5, 11), (6, 7), (8, 9), (12, 14), (13, 15)],
+        [(1, 2), (3, 12), (4, 6), (5, 7), (8, 10), (9, 11), (13, 14)],
+        [(1, 4), (2, 6), (5, 8), (7, 10), (9, 13), (11, 14)], [(2, 4), (3, 6), (9, 12), (11, 13)],
+        [(3, 5), (6, 8), (7, 9), (10, 12)], [(3, 4), (5, 6), (7, 8), (9, 10), (11, 12)], [(6, 7), (8, 9)]],
+}
+
+_NETWORK_MAX = max(_SORTING_NETWORKS)
+
+_network_kernels = {}
+
+def _sorting_network(collection_len):
+    """Comparators (i, j), i < j, of the sorting network for collection_len items.
+        Networks missing from _SORTING_NETWORKS are made of the next larger one by
+        dropping its highest wires: they would hold the largest items, which the
+        comparators touching them never move"""
+    network_len = min(network_len for network_len in _SORTING_NETWORKS if network_len >= collection_len)
+    return [(i, j) for layer in _SORTING_NETWORKS[network_len] for i, j in layer if j < collection_len]
+
+def _network_kernel(collection_len):
+    """Function sorting a list of collection_len items with the sorting network.
+
+        The network is unrolled to straight-line code: items are unpacked to local
+        variables, every comparator is a single compare and swap and the items are
+        put back with one slice assignment. Kernels are generated on the first use."""
+    kernel = _network_kernels.get(collection_len)
+    if kernel is None:
+        names = ['a%d' % i for i in range(collection_len)]
+        lines = ['def _network_sort_%d(collection):' % collection_len]
+        if collection_len < 2:
+            lines.append('    return')
+        else:
+            lines.append('    %s = collection' % ', '.join(names))
+            for i, j in _sorting_network(collection_len):
+                lines.append('    if a%d < a%d: a%d, a%d = a%d, a%d' % (j, i, i, j, j, i))
+            lines.append('    collection[:] = [%s]' % ', '.join(names))
+
+        namespace = {}
+        exec('\n'.join(lines), namespace)
+        kernel = _network_kernels[collection_len] = namespace['_network_sort_%d' % collection_len]
+    return kernel
+
+def network_sort(collection, compare_func=None, key=None, stats=None):
+    """Sorting network implementation for lists of up to 16 items
+
+        collection - source list to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        stats - SortStats instance to collect counters and timings to, if any
+
+        Items are sorted with a fixed sequence of compare-exchange operations, the
+        smallest known one for the list length. It's stable with key or
+        compare_func only, items equal by themselves may be reordered.
+        Performance - O(1) for up to 16 items
+        Worst case space complexity - O(1) auxilary
+        (http://en.wikipedia.org/wiki/Sorting_network)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    if len(collection) > _NETWORK_MAX:
+        raise ValueError('collection must have at most %d items' % _NETWORK_MAX)
+
+    _sort_by_key(collection, compare_func, key, stats, _network_sort)
+
+def _network_sort(collection, stats=None):
+    _network_kernel(len(collection))(collection)
+    if stats is not None:
+        stats.passes += 1
+
+def sort_many(collections, key=None):
+    """Sort every list of collections in place
+
+        collections - iterable of lists to be sorted
+        key - function computing a comparison key for each item. key(a) -> object
+
+        Made for many small lists: lists of up to 16 items are sorted with sorting
+        network kernels without any per-list checks, longer ones with tim_sort. The
+        sort is stable with key only, equal items themselves may be reordered."""
+    kernels = _network_kernels
+    for collection in collections:
+        collection_len = len(collection)
+        if collection_len > _NETWORK_MAX:
+            tim_sort(collection, key=key)
+            continue
+
+        kernel = kernels.get(collection_len) or _network_kernel(collection_len)
+        if key is None:
+            kernel(collection)
+        else:
+            decorated = [(key(item), position, item) for position, item in enumerate(collection)]
+            kernel(decorated)
+            collection[:] = [item for _, _, item in decorated]
+
+_SELECT_INSERTION_THRESHOLD = 16
+
+def _median_of_medians(collection, select_from, select_to):
+    """Pivot value guaranteed to have at least 30% of range items on each side:
+        median of medians of groups of 5 items"""
+    medians = []
+    for group_from in range(select_from, select_to, 5):
+        group = collection[group_from:min(group_from + 5, select_to)]
+        _binary_insertion_sort(group, 0, len(group), 1)
+        medians.append(group[(len(group) - 1) // 2])
+    middle = (len(medians) - 1) // 2
+    _select(medians, middle)
+    return medians[middle]
+
+def _select(collection, k):
+    select_from, select_to = 0, len(collection)
+    # every two partitions should at least halve the range, switch to median of
+    # medians pivots for good when quickselect doesn't keep up, so the ranges
+    # shrink geometrically either way
+    use_median_of_medians = False
+    checked_len, partitions = select_to, 0
+    while select_to - select_from > _SELECT_INSERTION_THRESHOLD:
+        if use_median_of_medians:
+            pivot = _median_of_medians(collection, select_from, select_to)
+        else:
+            pivot = _choose_pivot(collection, select_from, select_to)
+
+        less_to, greater_from = _partition(collection, select_from, select_to, pivot)
+        if k < less_to:
+            select_to = less_to
+        elif k >= greater_from:
+            select_from = greater_from
+        else:
+            return
+
+        if not use_median_of_medians:
+            partitions += 1
+            if partitions == 2:
+                use_median_of_medians = 2 * (select_to - select_from) > checked_len
+                checked_len, partitions = select_to - select_from, 0
+
+    _binary_insertion_sort(collection, select_from, select_to, select_from + 1)
+
+def select(collection, k, compare_func=None, key=None):
+    """Introselect implementation
+
+        collection - source list to be rearranged
+        k - index of the item to be selected
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+
+        Rearranges collection in place, so collection[k] is the item which would be
+        there if the collection was sorted, items before it are not greater and
+        items after it are not less than it. Returns collection[k], e.g. median
+        for k = len(collection) // 2.
+        Quickselect with three-way partition and median of three or ninther pivots
+        narrows the range to the side containing k. When two partitions in a row
+        don't halve the range, the rest of pivots are chosen with median of
+        medians, which shrinks the range by at least 30% every partition, so the
+        worst case stays linear.
+        Worst case performance - O(n)
+        Average case performance - O(n)
+        (http://en.wikipedia.org/wiki/Introselect)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    if not 0 <= k < len(collection):
+        raise IndexError('k is out of collection')
+
+    _sort_by_key(collection, compare_func, key, None, _select, k)
+    return collection[k]
+
+def _partial_sort(collection, k):
+    if k < len(collection):
+        _select(collection, k)
+    head = collection[:k]
+    _tim_sort(head)
+    collection[:k] = head
+
+def partial_sort(collection, k, compare_func=None, key=None):
+    """Partial sort implementation
+
+        collection - source list to be partially sorted
+        k - number of the smallest items to be sorted
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+
+        Rearranges collection in place, so the first k items are the k smallest
+        items in sorted order, the rest items are left in unspecified order.
+        Items are selected with introselect and the first k are sorted with tim sort.
+        The sort is stable for the first k items if key or compare_func is used,
+        items equal by them are ordered by their original positions.
+        Worst case performance - O(n + k log k)
+        Worst case space complexity - O(k) auxilary"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    if k < 0:
+        raise ValueError('k must not be negative')
+
+    _sort_by_key(collection, compare_func, key, None, _partial_sort, k)
+
+def nsmallest(iterable, n, compare_func=None, key=None):
+    """List of n smallest items of iterable in sorted order
+
+        iterable - any iterable, it's consumed once
+        n - number of items to be returned
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+
+        Items are passed through a heap bounded to n items, so memory use doesn't
+        depend on the length of iterable. Equal items keep their original order.
+        Worst case performance - O(m log n), m - number of items in iterable
+        Worst case space complexity - O(n)"""
+
+    if compare_func is not None and key is not None:
+        raise ValueError('compare_func and key are mutually exclusive')
+
+    if compare_func is not None:
+        key = cmp_to_key(compare_func)
+    return _heap_nsmallest(n, iterable, key)
+
+def nlargest(iterable, n, compare_func=None, key=None):
+    """List of n largest items of iterable in reverse sorted order
+
+        Same as nsmallest, but returns the largest items."""
+
+    if compare_func is not None and key is not None:
+        raise ValueError('compare_func and key are mutually exclusive')
+
+    if compare_func is not None:
+        key = cmp_to_key(compare_func)
+    return _heap_nlargest(n, iterable, key)
+
+_SORTED_LIST_BLOCK_SIZE = 1000
+
+class SortedList(object):
+    """Sorted list implementation
+
+        iterable - initial items, if any
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        block_size - number of items per block, blocks are split when they become
+            twice longer and joined with the next block when they become twice shorter
+
+        Items are kept in a list of sorted blocks with an index of the last (maximal)
+        key of every block. Items are located by binary search over the index and
+        then over a single block, so add, remove and bisect make O(log n)
+        comparisons and move at most 2*block_size items. Positions of items are
+        found with a Fenwick tree of block lengths, which add and remove update in
+        O(log n) and which is rebuilt on the first positional access after blocks
+        are split or joined, so bisect and indexing take O(log n) amortized. Keys
+        are computed once per item and kept next to the items. Items with equal keys
+        keep the order of insertion. update merges sorted batch of items with the
+        existing items in a single pass instead of adding them one by one."""
+
+    def __init__(self, iterable=None, compare_func=None, key=None, block_size=_SORTED_LIST_BLOCK_SIZE):
+        if compare_func is not None and key is not None:
+            raise ValueError('compare_func and key are mutually exclusive')
+
+        if block_size < 1:
+            raise ValueError('block_size must be positive')
+
+        self._key = cmp_to_key(compare_func) if compare_func is not None else key
+        self._block_size = block_size
+        self._len = 0
+        # blocks of items, blocks of their keys (the same lists if there is no key)
+        # and the last key of every block
+        self._items = []
+        self._keys = []
+        self._maxes = []
+        # Fenwick tree of block lengths, None after the blocks have changed
+        self._lengths = None
+
+        if iterable is not None:
+            self.update(iterable)
+
+    def _key_of(self, item):
+        return item if self._key is None else self._key(item)
+
+    def add(self, item):
+        """Add item, after all the items with equal key"""
+        item_key = self._key_of(item)
+        if not self._maxes:
+            items = [item]
+            self._items.append(items)
+            self._keys.append(items if self._key is None else [item_key])
+            self._maxes.append(item_key)
+            self._len = 1
+            self._lengths = None
+            return
+
+        block = bisect_right(self._maxes, item_key)
+        if block == len(self._maxes):
+            block -= 1
+            self._maxes[block] = item_key
+
+        items, keys = self._items[block], self._keys[block]
+        position = bisect_right(keys, item_key)
+        items.insert(position, item)
+        if keys is not items:
+            keys.insert(position, item_key)
+        self._len += 1
+
+        if len(items) > 2 * self._block_size:
+            self._split(block)
+        else:
+            self._update_length(block, 1)
+
+    def _split(self, block):
+        items, keys = self._items[block], self._keys[block]
+        half = len(items) // 2
+        new_items = items[half:]
+        del items[half:]
+        if keys is items:
+            new_keys = new_items
+        else:
+            new_keys = keys[half:]
+            del keys[half:]
+
+        self._items.insert(block + 1, new_items)
+        self._keys.insert(block + 1, new_keys)
+        self._maxes.insert(block + 1, new_keys[-1])
+        self._maxes[block] = keys[-1]
+        self._lengths = None
+
+    def _locate(self, item):
+        """(block, position) tuple of item equal to the given one or None"""
+        item_key = self._key_of(item)
+        block = bisect_left(self._maxes, item_key)
+        while block < len(self._maxes):
+            items, keys = self._items[block], self._keys[block]
+            position = bisect_left(keys, item_key)
+            while position < len(keys) and not item_key < keys[position]:
+                if items[position] == item:
+                    return block, position
+                position += 1
+            if position < len(keys):
+                return None
+            block += 1
+        return None
+
+    def discard(self, item):
+        """Remove item equal to the given one if there is any. Returns whether the item was removed"""
+        location = self._locate(item)
+        if location is None:
+            return False
+
+        block, position = location
+        items, keys = self._items[block], self._keys[block]
+        del items[position]
+        if keys is not items:
+            del keys[position]
+        self._len -= 1
+
+        if not items:
+            del self._items[block], self._keys[block], self._maxes[block]
+            self._lengths = None
+            return True
+
+        self._maxes[block] = keys[-1]
+        if len(items) < self._block_size // 2 and block + 1 < len(self._items):
+            self._lengths = None
+            next_items, next_keys = self._items[block + 1], self._keys[block + 1]
+            items.extend(next_items)
+            if keys is not items:
+                keys.extend(next_keys)
+            self._maxes[block] = self._maxes[block + 1]
+            del self._items[block + 1], self._keys[block + 1], self._maxes[block + 1]
+            if len(items) > 2 * self._block_size:
+                self._split(block)
+        else:
+            self._update_length(block, -1)
+        return True
+
+    def remove(self, item):
+        """Remove item equal to the given one, raise ValueError if there is no such item"""
+        if not self.discard(item):
+            raise ValueError('item is not in SortedList')
+
+    def _build_lengths(self):
+        lengths = [0] + [len(items) for items in self._items]
+        for node in range(1, len(lengths)):
+            parent = node + (node & -node)
+            if parent < len(lengths):
+                lengths[parent] += lengths[node]
+        self._lengths = lengths
+        return lengths
+
+    def _update_length(self, block, delta):
+        lengths = self._lengths
+        if lengths is None:
+            return
+        node = block + 1
+        while node < len(lengths):
+            lengths[node] += delta
+            node += node & -node
+
+    def _index(self, block, position):
+        """Index of the item at position of block"""
+        lengths = self._lengths if self._lengths is not None else self._build_lengths()
+        node = block
+        while node:
+            position += lengths[node]
+            node -= node & -node
+        return position
+
+    def _position(self, index):
+        """(block, position) tuple of the item at index"""
+        lengths = self._lengths if self._lengths is not None else self._build_lengths()
+        block = 0
+        step = 1 << (len(lengths).bit_length() - 1)
+        while step:
+            node = block + step
+            if node < len(lengths) and lengths[node] <= index:
+                block = node
+                index -= lengths[node]
+            step >>= 1
+        return block, index
+
+    def bisect_left(self, item):
+        """Index to insert item before all the items with equal key"""
+        item_key = self._key_of(item)
+        block = bisect_left(self._maxes, item_key)
+        if block == len(self._maxes):
+            return self._len
+        return self._index(block, bisect_left(self._keys[block], item_key))
+
+    def bisect_right(self, item):
+        """Index to insert item after all the items with equal key"""
+        item_key = self._key_of(item)
+        block = bisect_right(self._maxes, item_key)
+        if block == len(self._maxes):
+            return self._len
+        return self._index(block, bisect_right(self._keys[block], item_key))
+
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True)):
+        """Iterate over items with keys between keys of minimum and maximum
+
+            minimum, maximum - items bounding the range, range is not bounded from
+                the side if it's None
+            inclusive - tuple of flags whether minimum and maximum are included"""
+        if minimum is None:
+            block, position = 0, 0
+        else:
+            minimum_key = self._key_of(minimum)
+            find = bisect_left if inclusive[0] else bisect_right
+            block = find(self._maxes, minimum_key)
+            if block == len(self._maxes):
+                return
+            position = find(self._keys[block], minimum_key)
+
+        if maximum is not None:
+            maximum_key = self._key_of(maximum)
+
+        while block < len(self._items):
+            items, keys = self._items[block], self._keys[block]
+            for position in range(position, len(items)):
+                if maximum is not None:
+                    if maximum_key < keys[position] if inclusive[1] else not keys[position] < maximum_key:
+                        return
+                yield items[position]
+            block, position = block + 1, 0
+
+    def update(self, iterable):
+        """Add all the items of iterable
+
+            Short batches are added one by one. Longer ones are sorted with tim sort
+            and merged with the existing items in a single pass, equal keys from the
+            batch go after the existing ones."""
+        batch = list(iterable)
+        # every add moves up to 2*block_size items, merge moves all of them
+        if len(batch) * self._block_size < self._len:
+            for item in batch:
+                self.add(item)
+            return
+
+        if self._key is None:
+            tim_sort(batch)
+            merged = [item for items in self._items for item in items] + batch
+            existing_len = len(merged) - len(batch)
+            if existing_len and batch:
+                buffer = [None] * len(merged)
+                _merge(merged, buffer, (0, existing_len - 1), (existing_len, len(merged) - 1))
+                merged = buffer
+            self._rebuild(merged, merged)
+            return
+
+        # positions are unique, so the decorated tuples never compare the items
+        # and the existing items go before batch items with equal keys
+        existing = [item for items in self._items for item in items]
+        decorated = [(item_key, position) for position, item_key in enumerate(item_key
+            for keys in self._keys for item_key in keys)]
+        decorated_batch = [(self._key(item), len(existing) + position) for position, item in enumerate(batch)]
+        _tim_sort(decorated_batch)
+        existing_len = len(decorated)
+        decorated.extend(decorated_batch)
+        if existing_len and batch:
+            buffer = [None] * len(decorated)
+            _merge(decorated, buffer, (0, existing_len - 1), (existing_len, len(decorated) - 1))
+            decorated = buffer
+
+        existing.extend(batch)
+        self._rebuild([existing[position] for _, position in decorated], [item_key for item_key, _ in decorated])
+
+    def _rebuild(self, items, keys):
+        size = self._block_size
+        self._items = [items[block_from:block_from + size] for block_from in range(0, len(items), size)]
+        if keys is items:
+            # blocks are shared, the outer lists are not: blocks are inserted and
+            # deleted in both of them
+            self._keys = list(self._items)
+        else:
+            self._keys = [keys[block_from:block_from + size] for block_from in range(0, len(keys), size)]
+        self._maxes = [block_keys[-1] for block_keys in self._keys]
+        self._len = len(items)
+        self._lengths = None
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for items in self._items:
+            for item in items:
+                yield item
+
+    def __contains__(self, item):
+        return self._locate(item) is not None
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('SortedList index out of range')
+        block, position = self._position(index)
+        return self._items[block][position]
+
+    def __repr__(self):
+        return 'SortedList(%r)' % list(self)
+
+_numpy = None
+
+def _import_numpy():
+    """Import NumPy on the first use. Returns the module or None if it's not installed"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+_INTEGER_TYPES = (int,)
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+_FLOAT_EXACT_INT_MAX = 2 ** 53
+
+def _numeric_dtype(collection):
+    """Name of NumPy dtype representing every item of the list exactly
+
+        Returns 'int64' for integers fitting into 64 bits, 'float64' for floats
+        mixed with integers not greater than 2^53 by absolute value and None if
+        the list contains anything else, including NaN and bool."""
+    has_float = False
+    int_min = int_max = 0
+    for item in collection:
+        item_type = type(item)
+        if item_type is float:
+            if item != item:
+                return None
+            has_float = True
+        elif item_type in _INTEGER_TYPES:
+            if item < int_min:
+                int_min = item
+            elif item > int_max:
+                int_max = item
+        else:
+            return None
+
+    if has_float:
+        if -int_min > _FLOAT_EXACT_INT_MAX or int_max > _FLOAT_EXACT_INT_MAX:
+            return None
+        return 'float64'
+    if int_min < _INT64_MIN or int_max > _INT64_MAX:
+        return None
+    return 'int64'
+
+def numeric_sort(collection, use_numpy=True):
+    """Vectorized sort of numeric collections
+
+        collection - list of ints and floats, array.array or 1-dimensional
+            numpy.ndarray to be sorted in place
+        use_numpy - use NumPy if it's installed. Pure Python tim_sort is used otherwise
+
+        Items are compared directly, no compare function or key is supported.
+        Lists are converted to int64 or float64 NumPy array, which is stable argsorted
+        (NumPy uses radix sort for short integers and Timsort otherwise) and the list
+        is rearranged by the permutation, so it keeps the original item objects.
+        Lists which can't be represented exactly (big integers, NaN, non-numeric
+        items) and arrays of floats containing NaN are sorted with tim_sort.
+        The result is identical to one of merge_sort."""
+
+    numpy = _import_numpy() if use_numpy else None
+
+    if isinstance(collection, list):
+        dtype = _numeric_dtype(collection) if numpy is not None else None
+        if dtype is None:
+            tim_sort(collection)
+        else:
+            order = numpy.array(collection, dtype=dtype).argsort(kind='mergesort')
+            collection[:] = [collection[position] for position in order.tolist()]
+    elif isinstance(collection, array):
+        values = None
+        if numpy is not None and collection.typecode not in ('c', 'u'):
+            values = numpy.array(collection, dtype=collection.typecode)
+            if values.dtype.kind == 'f' and numpy.isnan(values).any():
+                values = None
+
+        if values is None:
+            values = collection.tolist()
+            tim_sort(values)
+            collection[:] = array(collection.typecode, values)
+        else:
+            values.sort(kind='mergesort')
+            collection[:] = array(collection.typecode, values.tobytes())
+    elif numpy is not None and isinstance(collection, numpy.ndarray):
+        if collection.ndim != 1:
+            raise ValueError('collection must be 1-dimensional')
+        collection.sort(kind='mergesort')
+    else:
+        raise TypeError('collection is not instance of list, array or numpy.ndarray')
+
+def _keys_of(collection, key):
+    return collection if key is None else [key(item) for item in collection]
+
+def counting_sort(collection, key=None, stats=None):
+    """Counting sort implementation
+
+        collection - source list to be sorted
+        key - function computing an integer key for each item. key(a) -> int.
+            Items must be integers themselves if it's None
+        stats - SortStats instance to collect number of passes and moves to, if any
+
+        Number of items for every key value between the minimal and the maximal key
+        is counted, running totals of the counts give the position of the first
+        item with every key and items are put to their positions in the original
+        order, so the sort is stable. Negative keys are supported.
+        Worst case performance - O(n + k), k - range of keys
+        Worst case space complexity - O(n + k) auxilary
+        (http://en.wikipedia.org/wiki/Counting_sort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    if len(collection) < 2:
+        return
+
+    keys = _keys_of(collection, key)
+    key_min = min(keys)
+    positions = [0] * (max(keys) - key_min + 1)
+    for item_key in keys:
+        positions[item_key - key_min] += 1
+
+    total = 0
+    for index, count in enumerate(positions):
+        positions[index] = total
+        total += count
+
+    result = [None] * len(collection)
+    for item, item_key in zip(collection, keys):
+        index = item_key - key_min
+        result[positions[index]] = item
+        positions[index] += 1
+    collection[:] = result
+    if stats is not None:
+        stats.passes += 1
+        stats.moves += len(result)
+
+_MSD_CUTOFF = 32
+
+def _lsd_radix_sort(collection, keys, radix_bits, stats):
+    key_min = min(keys)
+    span = max(keys) - key_min
+    mask = (1 << radix_bits) - 1
+    work = [(item_key - key_min, item) for item_key, item in zip(keys, collection)]
+
+    shift = 0
+    while span >> shift:
+        if stats is not None:
+            stats.passes += 1
+        buckets = [[] for _ in range(mask + 1)]
+        for entry in work:
+            buckets[(entry[0] >> shift) & mask].append(entry)
+        work = [entry for bucket in buckets for entry in bucket]
+        shift += radix_bits
+
+    collection[:] = [item for _, item in work]
+
+def _msd_radix_sort(collection, keys, stats):
+    result = []
+    stack = [([(item_key, position, item) for position, (item_key, item) in enumerate(zip(keys, collection))], 0)]
+    while stack:
+        bucket, depth = stack.pop()
+        if len(bucket) <= _MSD_CUTOFF:
+            # keys of the bucket share prefix of depth length, so they are compared
+            # natively and positions keep the order of equal keys
+            _tim_sort(bucket)
+            result.extend(item for _, _, item in bucket)
+            continue
+
+        if stats is not None:
+            stats.passes += 1
+        buckets = {}
+        for entry in bucket:
+            if len(entry[0]) == depth:
+                result.append(entry[2])
+            else:
+                buckets.setdefault(entry[0][depth], []).append(entry)
+
+        for symbol in sorted(buckets, reverse=True):
+            stack.append((buckets[symbol], depth + 1))
+
+    collection[:] = result
+
+def radix_sort(collection, key=None, radix_bits=8, stats=None):
+    """Radix sort implementation
+
+        collection - source list to be sorted
+        key - function computing a key for each item. key(a) -> int, str or bytes.
+            Items are used as keys if it's None
+        radix_bits - number of key bits processed per pass for integer keys
+        stats - SortStats instance to collect number of passes to, if any
+
+        Integer keys are sorted with least significant digit radix sort: keys are
+        offset by the minimal key, so negative keys are supported, and items are
+        distributed to 2^radix_bits buckets by a digit of the key, from the least
+        significant to the most significant one. Buckets are concatenated after
+        every pass keeping the order of items, so the sort is stable.
+        String and bytes keys of any length are sorted with most significant digit
+        radix sort, one character per level. Keys ending at the current level go
+        first, buckets with up to 32 items are finished with tim_sort.
+        Worst case performance - O(n * w / radix_bits), w - bit width of key range,
+            O(n * l) for strings, l - length of key
+        Worst case space complexity - O(n + 2^radix_bits) auxilary
+        (http://en.wikipedia.org/wiki/Radix_sort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    if radix_bits < 1:
+        raise ValueError('radix_bits must be positive')
+
+    if len(collection) < 2:
+        return
+
+    keys = _keys_of(collection, key)
+    if isinstance(keys[0], _INTEGER_TYPES):
+        _lsd_radix_sort(collection, keys, radix_bits, stats)
+    elif isinstance(keys[0], (str, bytes, bytearray)):
+        _msd_radix_sort(collection, keys, stats)
+    else:
+        raise TypeError('keys must be integers, strings or bytes')
+
+def bucket_sort(collection, key=None, bucket_count=None, stats=None):
+    """Bucket sort implementation
+
+        collection - source list to be sorted
+        key - function computing a numeric key for each item. key(a) -> int or float.
+            Items are used as keys if it's None
+        bucket_count - number of buckets, equals to collection length by default
+        stats - SortStats instance to collect number of passes and moves to, if any
+
+        The range between minimal and maximal keys is split into bucket_count equal
+        intervals and items are distributed to the buckets by the interval of their
+        key in the original order. Every bucket is sorted with tim_sort and buckets
+        are concatenated. The sort is stable.
+        Worst case performance - O(n log n)
+        Average case performance - O(n + k) for uniformly distributed keys
+        Worst case space complexity - O(n + k) auxilary
+        (http://en.wikipedia.org/wiki/Bucket_sort)"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    collection_len = len(collection)
+    if bucket_count is None:
+        bucket_count = collection_len
+    elif bucket_count < 1:
+        raise ValueError('bucket_count must be positive')
+
+    if collection_len < 2:
+        return
+
+    keys = _keys_of(collection, key)
+    key_min = min(keys)
+    span = max(keys) - key_min
+    if not span:
+        return
+
+    scale = (bucket_count - 1) / float(span)
+    buckets = [[] for _ in range(bucket_count)]
+    for position, (item_key, item) in enumerate(zip(keys, collection)):
+        buckets[int((item_key - key_min) * scale)].append((item_key, position, item))
+
+    result = []
+    for bucket in buckets:
+        if len(bucket) > 1:
+            _tim_sort(bucket)
+        result.extend(item for _, _, item in bucket)
+    collection[:] = result
+    if stats is not None:
+        stats.passes += 1
+        stats.moves += len(result)
+
+_DISPATCH_SMALL = 32
+_DISPATCH_RUN_RATIO = 32
+_DISPATCH_SAMPLE_SIZE = 1024
+
+def _duplicate_ratio(keys):
+    """Share of duplicates among up to _DISPATCH_SAMPLE_SIZE evenly spaced keys"""
+    step = max(len(keys) // _DISPATCH_SAMPLE_SIZE, 1)
+    sample = keys[::step]
+    try:
+        return 1.0 - len(set(sample)) / float(len(sample))
+    except TypeError:
+        return 0.0
+
+def _choose_engine(keys, stable, plain):
+    """Name of the sort expected to be the fastest for keys
+
+        plain - keys are the items themselves, so numeric_sort may be used"""
+    keys_len = len(keys)
+    if keys_len <= _DISPATCH_SMALL:
+        return 'insertion_sort'
+
+    runs_count = 0
+    for _ in _get_sorted_sequences(keys):
+        runs_count += 1
+    if runs_count * _DISPATCH_RUN_RATIO <= keys_len:
+        return 'tim_sort'
+
+    if plain and _import_numpy() is not None and _numeric_dtype(keys) is not None:
+        return 'numeric_sort'
+
+    if all(type(item_key) in _INTEGER_TYPES for item_key in keys):
+        span = max(keys) - min(keys)
+        if span <= 2 * keys_len:
+            return 'counting_sort'
+        if span.bit_length() <= 32:
+            return 'radix_sort'
+
+    if not stable and _duplicate_ratio(keys) >= 0.5:
+        return 'intro_sort'
+
+    return 'tim_sort'
+
+_ENGINES = {
+    'insertion_sort': _insertion_sort,
+    'tim_sort': _tim_sort,
+    'intro_sort': _intro_sort,
+    'numeric_sort': numeric_sort,
+    'counting_sort': counting_sort,
+    'radix_sort': radix_sort,
+}
+
+def sort(collection, key=None, stable=True):
+    """Adaptive sort
+
+        collection - source list to be sorted
+        key - function computing a comparison key for each item. key(a) -> object
+        stable - keep the original order of items with equal keys
+
+        Keys are computed once and sampled to choose the sort:
+            insertion_sort - up to 32 items
+            tim_sort - presorted lists, having less than one natural run per 32 items
+            numeric_sort - lists of numbers when NumPy is installed and key is None
+            counting_sort - integer keys with range up to twice the list length
+            radix_sort - integer keys with range fitting into 32 bits
+            intro_sort - lists with many equal keys when stable is False
+            tim_sort - everything else
+        Returns name of the chosen sort."""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    if key is None:
+        engine = _choose_engine(collection, stable, True)
+        _ENGINES[engine](collection)
+        return engine
+
+    decorated = [(key(item), position, item) for position, item in enumerate(collection)]
+    engine = _choose_engine([item_key for item_key, _, _ in decorated], stable, False)
+    if engine in ('counting_sort', 'radix_sort'):
+        _ENGINES[engine](decorated, itemgetter(0))
+    else:
+        _ENGINES[engine](decorated)
+    collection[:] = [item for _, _, item in decorated]
+    return engine
+
+def argsort(collection, key=None, stable=True):
+    """Permutation sorting collection
+
+        collection - sequence of items, it's not modified
+        key - function computing a comparison key for each item. key(a) -> object
+        stable - keep the original order of items with equal keys
+
+        Returns array('l') of indexes, so that [collection[i] for i in result] is
+        sorted. Indexes are sorted with sort() by the keys, so integer keys are sorted
+        with counting or radix sort."""
+
+    if key is None:
+        keys = collection
+    else:
+        keys = [key(item) for item in collection]
+
+    order = [position for position in range(len(keys))]
+    sort(order, keys.__getitem__, stable)
+    return array('l', order)
+
+def lexsort(columns, descending=False):
+    """Permutation sorting rows of columns lexicographically
+
+        columns - list of sequences of the same length. The first column is the primary
+            key, the second one breaks ties of the first one and so on
+        descending - True to sort all columns in descending order, or a sequence of
+            booleans, one per column
+
+        Returns array('l') of row indexes. Columns are sorted one by one from the last
+        to the first with stable sort() of the permutation, so no tuples of rows are
+        built. Rows with all keys equal keep their original order."""
+
+    columns = list(columns)
+    if not columns:
+        raise ValueError('at least one column is required')
+
+    rows_count = len(columns[0])
+    for column in columns:
+        if len(column) != rows_count:
+            raise ValueError('columns must have the same length')
+
+    if isinstance(descending, bool):
+        descending = [descending] * len(columns)
+    elif len(descending) != len(columns):
+        raise ValueError('descending must have a flag for every column')
+
+    order = [position for position in range(rows_count)]
+    for column, column_descending in reversed(list(zip(columns, descending))):
+        # stable descending sort is a stable ascending sort of the reversed order
+        if column_descending:
+            order.reverse()
+        sort(order, column.__getitem__)
+        if column_descending:
+            order.reverse()
+    return array('l', order)
+
+def apply_permutation(collection, order):
+    """Reorder collection in place, so item collection[order[i]] is put to position i
+
+        collection - list or array to be reordered
+        order - permutation of collection indexes, e.g. returned by argsort or lexsort
+
+        Permutation cycles are followed, so every item is moved once and no copy of
+        collection is made. The same order may be applied to several parallel lists."""
+
+    collection_len = len(collection)
+    if len(order) != collection_len:
+        raise ValueError('order must have the same length as collection')
+
+    done = bytearray(collection_len)
+    for position in order:
+        if not 0 <= position < collection_len or done[position]:
+            raise ValueError('order is not a permutation of collection indexes')
+        done[position] = 1
+
+    done = bytearray(collection_len)
+    for start in range(collection_len):
+        if done[start] or order[start] == start:
+            continue
+
+        first = collection[start]
+        position = start
+        while True:
+            done[position] = 1
+            source = order[position]
+            if source == start:
+                collection[position] = first
+                break
+            collection[position] = collection[source]
+            position = source
+
+def _identity(item):
+    return item
+
+def _merge_runs(runs, key):
+    """K-way merge of sorted iterables
+
+        runs - list of iterables sorted by key
+        key - function computing a comparison key for each record
+
+        Heads of all runs are kept in a heap as (key, run index, record, run) tuples.
+        Run indexes are unique, so records are never compared and on equal keys the
+        record from the earlier run is produced first, which keeps the merge stable."""
+    heap = []
+    for index, run in enumerate(runs):
+        run = iter(run)
+        for record in run:
+            heap.append((key(record), index, record, run))
+            break
+    heapify(heap)
+
+    while heap:
+        _, index, record, run = heap[0]
+        yield record
+        for record in run:
+            heapreplace(heap, (key(record), index, record, run))
+            break
+        else:
+            heappop(heap)
@@ -0,0 +1,221 @@
+"""Command line sort of lines
+
+Usage:
+    python -m sort [-k POS1[,POS2]] [-t SEP] [-b] [-n] [-r] [-u] [-s] [-o FILE] [FILE ...]
+
+Lines of the files, or of standard input without them or for "-", are sorted as
+bytes. Input
+is read in chunks of _READ_SIZE bytes. Lines are collected into in-memory runs
+limited by --buffer-size and sorted with merge_sort, runs which don't fit are
+spilled to temporary files and k-way merged by external_sort. Output is written
+in batches of _WRITE_LINES lines.
+
+Like in Unix sort, without --field-separator fields are separated by the empty
+string between a non-blank and a blank character, so every field includes its
+leading blanks unless --ignore-leading-blanks is given. A key without POS2
+extends to the end of line, lines with
+equal keys are ordered by the whole line unless --stable is given, and --unique
+keeps the first line in input order of every group of equal keys, as it implies
+--stable."""
+
+import argparse
+from itertools import islice
+import re
+import sys
+
+from . import external_sort
+
+_READ_SIZE = 1024 * 1024
+_WRITE_LINES = 4096
+
+_SIZE_SUFFIXES = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+_BLANKS = b' \t'
+# a blank separated field with its leading blanks
+_BLANK_FIELD = re.compile(br'[ \t]*[^ \t]+')
+
+class _Reversed(object):
+    """Key wrapper reversing the order of keys"""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+def _read_lines(files):
+    """Lines generator of binary files read in chunks of _READ_SIZE bytes. Lines
+        are produced without newlines, the last line of a file may lack it"""
+    for input_file in files:
+        rest = b''
+        while True:
+            chunk = input_file.read(_READ_SIZE)
+            if not chunk:
+                break
+            lines = (rest + chunk).split(b'\n') if rest else chunk.split(b'\n')
+            rest = lines.pop()
+            for line in lines:
+                yield line
+        if rest:
+            yield rest
+
+def _write_lines(lines, output):
+    """Write newline terminated lines to binary output in batches of _WRITE_LINES"""
+    lines = iter(lines)
+    while True:
+        batch = list(islice(lines, _WRITE_LINES))
+        if not batch:
+            return
+        batch.append(b'')
+        output.write(b'\n'.join(batch))
+
+def _unique_lines(lines, key):
+    """Lines generator dropping every line whose key equals to the key of the
+        previous line"""
+    previous = object()
+    for line in lines:
+        line_key = line if key is None else key(line)
+        if line_key != previous:
+            previous = line_key
+            yield line
+
+def _position(value):
+    """Parse POS1[,POS2] of --key into (from, to) field slice bounds, to is None
+        without POS2, so the key extends to the last field"""
+    try:
+        positions = [int(position) for position in value.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid key %r' % value)
+    if len(positions) > 2 or min(positions) < 1:
+        raise argparse.ArgumentTypeError('invalid key %r' % value)
+    return positions[0] - 1, positions[1] if len(positions) == 2 else None
+
+def _size(value):
+    """Parse --buffer-size, a number of bytes with optional K, M or G suffix"""
+    multiplier = _SIZE_SUFFIXES.get(value[-1:].upper())
+    try:
+        size = int(value[:-1] if multiplier else value) * (multiplier or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid size %r' % value)
+    if size <= 0:
+        raise argparse.ArgumentTypeError('invalid size %r' % value)
+    return size
+
+def _numeric_value(field, number_prefix):
+    """Value of the leading number of field, 0 if it doesn't start with a number"""
+    match = number_prefix.match(field)
+    return float(match.group()) if match else 0.0
+
+def _blank_separated(line, positions):
+    """Parts of line from field_from to field_to of every position, fields are
+        separated by blanks and include their leading blanks"""
+    spans = [match.span() for match in _BLANK_FIELD.finditer(line)]
+    values = []
+    for field_from, field_to in positions:
+        start = spans[field_from][0] if field_from < len(spans) else len(line)
+        end = spans[field_to - 1][1] if field_to is not None and field_to <= len(spans) else len(line)
+        values.append(line[start:end] if start < end else b'')
+    return values
+
+def _field_key(positions, separator, numeric, ignore_blanks):
+    """Function computing comparison key of a line from its fields, or None if the
+        whole line is compared as is"""
+    if numeric:
+        number_prefix = re.compile(br'\s*[-+]?(?:\d+(?:\.\d*)?|\.\d+)')
+
+    if not positions:
+        if numeric:
+            return lambda line: _numeric_value(line, number_prefix)
+        if ignore_blanks:
+            return lambda line: line.lstrip(_BLANKS)
+        return None
+
+    def field_key(line):
+        if separator is None:
+            values = _blank_separated(line, positions)
+        else:
+            fields = line.split(separator)
+            values = [separator.join(fields[field_from:field_to]) for field_from, field_to in positions]
+        if numeric:
+            values = [_numeric_value(value, number_prefix) for value in values]
+        elif ignore_blanks:
+            values = [value.lstrip(_BLANKS) for value in values]
+        return values[0] if len(values) == 1 else tuple(values)
+    return field_key
+
+def _sort_key(field_key, reverse, stable):
+    """Function computing the key lines are sorted by, or None if lines are sorted
+        by themselves"""
+    if field_key is not None and not stable:
+        # lines with equal keys are ordered by the whole line
+        key = lambda line: (field_key(line), line)
+    else:
+        key = field_key
+
+    if not reverse:
+        return key
+    if key is None:
+        return _Reversed
+    return lambda line: _Reversed(key(line))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sort', description='Sort lines of files or standard input')
+    parser.add_argument('files', nargs='*', metavar='FILE', help='files to sort, standard input by default')
+    parser.add_argument('-k', '--key', type=_position, action='append', metavar='POS1[,POS2]',
+        help='sort by fields from POS1 to POS2 (1-based, POS2 defaults to the last field), may be repeated')
+    parser.add_argument('-t', '--field-separator', metavar='SEP',
+        help='field separator, by default fields are separated by blanks and include their leading blanks')
+    parser.add_argument('-b', '--ignore-leading-blanks', action='store_true', help='ignore leading blanks of keys')
+    parser.add_argument('-n', '--numeric-sort', action='store_true', help='compare keys as numbers')
+    parser.add_argument('-r', '--reverse', action='store_true', help='sort in descending order')
+    parser.add_argument('-u', '--unique', action='store_true', help='output only the first input line of lines with equal keys, implies --stable')
+    parser.add_argument('-s', '--stable', action='store_true',
+        help='keep the input order of lines with equal keys instead of ordering them by the whole line')
+    parser.add_argument('-o', '--output', metavar='FILE', help='file to write to, standard output by default')
+    parser.add_argument('-S', '--buffer-size', type=_size, default=64 * 1024 * 1024, metavar='SIZE',
+        help='approximate memory used for in-memory runs, in bytes or with K, M or G suffix')
+    parser.add_argument('-T', '--temporary-directory', metavar='DIR', help='directory for temporary run files')
+    args = parser.parse_args(argv)
+
+    separator = args.field_separator
+    if separator is not None:
+        if not separator:
+            parser.error('empty field separator')
+        separator = separator.encode()
+
+    field_key = _field_key(args.key, separator, args.numeric_sort, args.ignore_leading_blanks)
+    # unique lines are sorted by key only, so the first input line of a group is kept
+    key = _sort_key(field_key, args.reverse, args.stable or args.unique)
+
+    input_files = [sys.stdin.buffer if path == '-' else open(path, 'rb', buffering=0) for path in args.files] or \
+        [sys.stdin.buffer]
+    try:
+        lines = external_sort(_read_lines(input_files), key=key, memory_limit=args.buffer_size,
+            temp_dir=args.temporary_directory)
+        if args.unique:
+            lines = _unique_lines(lines, field_key)
+
+        # the output is opened after the input is sorted, so it may be one of the inputs
+        lines = iter(lines)
+        first_lines = list(islice(lines, 1))
+        output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        try:
+            _write_lines(first_lines, output)
+            _write_lines(lines, output)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+            else:
+                output.flush()
+    finally:
+        for input_file in input_files:
+            if input_file is not sys.stdin.buffer:
+                input_file.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
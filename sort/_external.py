@@ -0,0 +1,309 @@
+"""External sorts of data larger than memory and of binary record files
+
+Imported on the first access to its functions from the sort package."""
+
+from array import array
+from functools import cmp_to_key
+from mmap import mmap, ACCESS_READ, ACCESS_WRITE
+from os.path import exists, getsize, samefile
+import pickle
+import re
+from struct import Struct, calcsize
+from sys import byteorder, getsizeof
+from tempfile import TemporaryFile
+from time import time
+
+from . import _identity, _merge_runs, merge_sort, sort
+
+_RUN_BLOCK_SIZE = 1024
+_POINTER_SIZE = calcsize('P')
+
+def _spill_run(records, temp_dir):
+    """Write records to a new temporary file in pickled blocks of _RUN_BLOCK_SIZE
+        records and return the file rewound to the beginning"""
+    run = TemporaryFile(dir=temp_dir)
+    block = []
+    for record in records:
+        block.append(record)
+        if len(block) == _RUN_BLOCK_SIZE:
+            pickle.dump(block, run, pickle.HIGHEST_PROTOCOL)
+            block = []
+    if block:
+        pickle.dump(block, run, pickle.HIGHEST_PROTOCOL)
+    run.seek(0)
+    return run
+
+def _read_run(run):
+    """Records generator for a run written by _spill_run"""
+    while True:
+        try:
+            block = pickle.load(run)
+        except EOFError:
+            return
+        for record in block:
+            yield record
+
+def external_sort(records, compare_func=None, key=None, memory_limit=64 * 1024 * 1024, fan_in=16, temp_dir=None,
+        stats=None):
+    """External merge sort implementation
+
+        records - iterable of records to be sorted, e.g. file object to sort its lines.
+            Records must be picklable
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively.
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func
+        memory_limit - approximate amount of memory in bytes to be used by records
+            of a single in-memory chunk. Estimated with sys.getsizeof, so memory
+            referenced by the records is not taken into account
+        fan_in - maximal number of runs merged at once
+        temp_dir - directory for temporary run files, system default if None
+        stats - SortStats instance to collect counters and timings to, if any.
+            Comparisons and moves are counted only while sorting the chunks, time
+            of reading and sorting chunks is reported as runs phase
+
+        Generator of sorted records. Records are read into chunks limited by
+        memory_limit, each chunk is sorted with merge sort and spilled to a temporary
+        file as a sorted run. Runs are merged with a heap, fan_in runs at a time,
+        until fan_in or less runs remain, which are merged into the output.
+        Input fitting into a single chunk is never written to disk.
+        The sort is stable.
+        (http://en.wikipedia.org/wiki/External_sorting)"""
+
+    if compare_func is not None and key is not None:
+        raise ValueError('compare_func and key are mutually exclusive')
+
+    if fan_in < 2:
+        raise ValueError('fan_in must be at least 2')
+
+    if key is not None:
+        merge_key = key
+    elif compare_func is not None:
+        merge_key = cmp_to_key(compare_func)
+    else:
+        merge_key = _identity
+
+    runs = []
+    try:
+        started = time()
+        chunk, chunk_size = [], 0
+        for record in records:
+            chunk.append(record)
+            chunk_size += getsizeof(record) + _POINTER_SIZE
+            if chunk_size >= memory_limit:
+                merge_sort(chunk, compare_func, key, stats)
+                runs.append(_spill_run(chunk, temp_dir))
+                chunk, chunk_size = [], 0
+
+        merge_sort(chunk, compare_func, key, stats)
+        if stats is not None:
+            stats.add_phase('runs', time() - started)
+
+        if not runs:
+            for record in chunk:
+                yield record
+            return
+
+        if chunk:
+            runs.append(_spill_run(chunk, temp_dir))
+        del chunk
+
+        while len(runs) > fan_in:
+            if stats is not None:
+                stats.passes += 1
+            merged_runs = []
+            for group_from in range(0, len(runs), fan_in):
+                group = runs[group_from:group_from + fan_in]
+                merged_runs.append(_spill_run(_merge_runs([_read_run(run) for run in group], merge_key), temp_dir))
+                for run in group:
+                    run.close()
+            runs = merged_runs
+
+        if stats is not None:
+            stats.passes += 1
+        for record in _merge_runs([_read_run(run) for run in runs], merge_key):
+            yield record
+    finally:
+        for run in runs:
+            run.close()
+
+def _terminated_lines(lines):
+    for line in lines:
+        if not line.endswith('\n'):
+            line += '\n'
+        yield line
+
+def external_sort_file(source, destination, compare_func=None, key=None, memory_limit=64 * 1024 * 1024,
+        fan_in=16, temp_dir=None):
+    """Sort lines of a file with external merge sort
+
+        source - path or file object to read lines from
+        destination - path or file object to write sorted lines to
+        compare_func, key, memory_limit, fan_in, temp_dir - same as for external_sort
+
+        Line without trailing newline at the end of source gets it in destination."""
+
+    source_file = open(source) if isinstance(source, str) else source
+    try:
+        destination_file = open(destination, 'w') if isinstance(destination, str) else destination
+        try:
+            destination_file.writelines(external_sort(_terminated_lines(source_file), compare_func, key,
+                memory_limit, fan_in, temp_dir))
+        finally:
+            if destination_file is not destination:
+                destination_file.close()
+    finally:
+        if source_file is not source:
+            source_file.close()
+
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+def _permute_records_in_place(records, record_size, order):
+    """Rearrange fixed size records of writable buffer, so record order[i] is put to
+        position i. Permutation cycles are followed, so every record is moved once and
+        only one record per cycle is copied aside."""
+    done = bytearray(len(order))
+    for start in range(len(order)):
+        if done[start] or order[start] == start:
+            continue
+
+        first = records[start * record_size:(start + 1) * record_size]
+        position = start
+        while True:
+            done[position] = 1
+            source = order[position]
+            if source == start:
+                records[position * record_size:(position + 1) * record_size] = first
+                break
+            records[position * record_size:(position + 1) * record_size] = \
+                records[source * record_size:(source + 1) * record_size]
+            position = source
+
+def _write_records(records, record_size, order, destination):
+    """Write fixed size records of buffer to destination file in order given by
+        permutation, in chunks of about _WRITE_BUFFER_SIZE bytes"""
+    chunk = []
+    chunk_len = max(_WRITE_BUFFER_SIZE // record_size, 1)
+    for source in order:
+        chunk.append(records[source * record_size:(source + 1) * record_size])
+        if len(chunk) == chunk_len:
+            destination.write(b''.join(chunk))
+            chunk = []
+    if chunk:
+        destination.write(b''.join(chunk))
+
+_KEY_FORMAT = re.compile(r'([@=<>!]?)(\d*)([a-zA-Z?])$')
+_SIGN_FLIP = bytes(value ^ 0x80 for value in range(256))
+
+def _key_bytes(key_struct):
+    """Offsets of the bytes of a single integer or bytes key, from the least to the
+        most significant one, and whether the key is signed, or None if keys can't
+        be sorted byte by byte"""
+    match = _KEY_FORMAT.match(key_struct.format)
+    if match is None:
+        return None
+    order, count, code = match.groups()
+    if code in 'sc':
+        little_endian, signed = False, False
+    elif code in 'BHILQ' and count in ('', '1'):
+        little_endian, signed = order == '<' or order in '@=' and byteorder == 'little', False
+    elif code in 'bhilq' and count in ('', '1'):
+        little_endian, signed = order == '<' or order in '@=' and byteorder == 'little', True
+    else:
+        return None
+    offsets = range(key_struct.size) if little_endian else range(key_struct.size - 1, -1, -1)
+    return list(offsets), signed
+
+def _radix_order(records, record_size, record_count, key_offset, key_bytes, signed):
+    """Array of record indexes in the order of their keys, sorted with LSD radix sort
+        one key byte per pass. Every pass slices the column of the key byte out of
+        the records in C and distributes the indexes by it, passes over columns with
+        a single value are skipped."""
+    order = array('q', range(record_count))
+    end = record_count * record_size
+    for pass_index, byte_offset in enumerate(key_bytes):
+        column = records[key_offset + byte_offset:end:record_size]
+        if signed and pass_index == len(key_bytes) - 1:
+            column = column.translate(_SIGN_FLIP)
+        if column.count(column[:1]) == record_count:
+            continue
+
+        starts = [0] * 256
+        total = 0
+        for digit in range(256):
+            starts[digit] = total
+            total += column.count(digit)
+
+        distributed = array('q', order)
+        for position in order:
+            digit = column[position]
+            distributed[starts[digit]] = position
+            starts[digit] += 1
+        order = distributed
+    return order
+
+def sort_records_file(source, record_format, key_format, key_offset=0, destination=None):
+    """Sort binary file of fixed size records
+
+        source - path of the file to be sorted
+        record_format - struct format of a record, e.g. '>Q48s' for 8 bytes integer key
+            and 48 bytes of payload. Only its size is used
+        key_format - struct format of the key of a record, e.g. '>Q' or '16s'. Records
+            are compared by the unpacked value, or a tuple of values if the format has
+            several fields
+        key_offset - offset of the key in a record in bytes
+        destination - path of the file to write sorted records to. Source file is
+            sorted in place if it's None or the same file as source
+
+        The file is memory mapped. Integer and bytes keys are not unpacked at all:
+        an array of record indexes is sorted with LSD radix sort over the key bytes
+        of the mapped records, so no objects are created per record. Other keys are
+        unpacked and sorted with sort() along with the record indexes. The resulting
+        permutation is applied to the records, so bytes of every record are moved
+        once. In place the permutation is applied by
+        following its cycles, otherwise records are written to destination in large
+        chunks. The sort is stable."""
+
+    record_size = calcsize(record_format)
+    key_struct = Struct(key_format)
+    if key_offset < 0 or key_offset + key_struct.size > record_size:
+        raise ValueError('key must be inside of record')
+    single_field = len(key_struct.unpack(b'\0' * key_struct.size)) == 1
+    if destination is not None and exists(destination) and samefile(source, destination):
+        # opening destination for writing would truncate the mapped source
+        destination = None
+
+    with open(source, 'rb' if destination is not None else 'r+b') as source_file:
+        file_size = getsize(source)
+        if file_size % record_size:
+            raise ValueError('file size is not multiple of record size')
+
+        if destination is not None and file_size == 0:
+            open(destination, 'wb').close()
+        if file_size == 0:
+            return
+
+        records = mmap(source_file.fileno(), 0, access=ACCESS_READ if destination is not None else ACCESS_WRITE)
+        try:
+            key_bytes = _key_bytes(key_struct)
+            if key_bytes is not None:
+                order = _radix_order(records, record_size, file_size // record_size, key_offset, *key_bytes)
+            else:
+                unpack_from = key_struct.unpack_from
+                if single_field:
+                    keys = [unpack_from(records, offset)[0] for offset in range(key_offset, file_size, record_size)]
+                else:
+                    keys = [unpack_from(records, offset) for offset in range(key_offset, file_size, record_size)]
+
+                order = [position for position in range(len(keys))]
+                sort(order, keys.__getitem__)
+                del keys
+
+            if destination is None:
+                _permute_records_in_place(records, record_size, order)
+                records.flush()
+            else:
+                with open(destination, 'wb') as destination_file:
+                    _write_records(records, record_size, order, destination_file)
+        finally:
+            records.close()
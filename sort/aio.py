@@ -0,0 +1,158 @@
+"""Asyncio variants of sorts of sort package
+
+Functions:
+merge_sort(collection, compare_func, key, executor, chunk_len, merge_steps) - coroutine
+    sorting list without blocking the event loop.
+sorted_records(records, compare_func, key, executor, chunk_len, merge_steps) - async
+    generator of sorted records of an iterable or async iterable.
+
+Records are split into chunks of chunk_len records, which are sorted with
+sort.merge_sort in executor. By default it's a single thread shared by all the
+sorts: sorting threads hold the GIL for a switch interval each, so the more of them
+run the longer the loop waits for its turn. A process pool executor may be given to
+sort chunks in parallel. Sorted chunks are runs merged in the event loop with the k-way merge of
+external_sort, which gives control back to the loop after every merge_steps
+records, so other tasks of the loop wait for at most merge_steps records to be
+merged. Both sorts are stable."""
+
+import asyncio
+from functools import cmp_to_key
+from itertools import islice
+
+from . import _identity, _merge_runs, merge_sort as _merge_sort
+
+_CHUNK_LEN = 65536
+_MERGE_STEPS = 4096
+
+_executor = None
+
+def _default_executor():
+    global _executor
+    if _executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _executor = ThreadPoolExecutor(1)
+    return _executor
+
+def _sort_chunk(chunk, compare_func, key, chunk_from):
+    """Sort chunk in the executor. With key (key, position) pairs are sorted and
+        returned, position being the index of the record in the whole collection"""
+    if key is not None:
+        chunk = [(key(item), position) for position, item in enumerate(chunk, chunk_from)]
+    _merge_sort(chunk, compare_func)
+    return chunk
+
+async def _merged_batches(chunks, compare_func, merge_steps):
+    """Async generator of lists of merge_steps merged records of sorted chunks"""
+    merged = _merge_runs(chunks, _identity if compare_func is None else cmp_to_key(compare_func))
+    while True:
+        batch = list(islice(merged, merge_steps))
+        if not batch:
+            return
+        yield batch
+        await asyncio.sleep(0)
+
+async def _records_of(records):
+    if hasattr(records, '__aiter__'):
+        async for record in records:
+            yield record
+    else:
+        for record in records:
+            yield record
+
+async def merge_sort(collection, compare_func=None, key=None, executor=None, chunk_len=_CHUNK_LEN,
+        merge_steps=_MERGE_STEPS):
+    """Merge sort coroutine
+
+        collection - source list to be sorted. It must not be modified until the
+            coroutine is done
+        compare_func - compare function. compare(a, b) -> int. Must return value
+            less, greater or equal to 0 if a < b, a > b or a == b respectively
+        key - function computing a comparison key for each item. key(a) -> object.
+            Mutually exclusive with compare_func. Keys are computed in the executor
+        executor - concurrent.futures executor to sort chunks in, a single thread by
+            default. compare_func and key must be picklable for process pools
+        chunk_len - number of items sorted in the executor at once
+        merge_steps - number of items merged between giving control back to the loop
+
+        Chunks are sorted concurrently in the executor and merged in the loop. With key
+        the executor sorts (key, position) pairs and the items are rearranged by
+        positions, so items never leave the calling thread.
+        Worst case performance - O(n log n)
+        Worst case space complexity - O(n) auxilary"""
+
+    if not isinstance(collection, list):
+        raise TypeError('collection is not instance of list')
+
+    if compare_func is not None and key is not None:
+        raise ValueError('compare_func and key are mutually exclusive')
+
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        executor = _default_executor()
+    chunks = await asyncio.gather(*[
+        loop.run_in_executor(executor, _sort_chunk, collection[chunk_from:chunk_from + chunk_len], compare_func,
+            key, chunk_from)
+        for chunk_from in range(0, len(collection), chunk_len)])
+
+    if key is None:
+        position = 0
+        async for batch in _merged_batches(chunks, compare_func, merge_steps):
+            collection[position:position + len(batch)] = batch
+            position += len(batch)
+    else:
+        result = []
+        async for batch in _merged_batches(chunks, None, merge_steps):
+            result.extend([collection[position] for _, position in batch])
+        collection[:] = result
+
+async def sorted_records(records, compare_func=None, key=None, executor=None, chunk_len=_CHUNK_LEN,
+        merge_steps=_MERGE_STEPS):
+    """Async generator of sorted records
+
+        records - iterable or async iterable of records to be sorted
+        compare_func - compare function. compare(a, b) -> int
+        key - function computing a comparison key for each record. key(a) -> object.
+            Mutually exclusive with compare_func
+        executor - concurrent.futures executor to sort chunks in, a single thread by
+            default
+        chunk_len - number of records sorted in the executor at once
+        merge_steps - number of records merged between giving control back to the loop
+
+        Every chunk is sent to the executor as soon as it's read, so chunks are
+        sorted while the rest of records is being received. All records are kept in
+        memory, use sort.external_sort for data larger than memory."""
+
+    if compare_func is not None and key is not None:
+        raise ValueError('compare_func and key are mutually exclusive')
+
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        executor = _default_executor()
+    futures = []
+    buffered = []
+    chunk = []
+    chunk_from = 0
+    async for record in _records_of(records):
+        chunk.append(record)
+        if len(chunk) == chunk_len:
+            futures.append(loop.run_in_executor(executor, _sort_chunk, chunk, compare_func, key, chunk_from))
+            if key is not None:
+                buffered.extend(chunk)
+            chunk_from += len(chunk)
+            chunk = []
+    if chunk:
+        futures.append(loop.run_in_executor(executor, _sort_chunk, chunk, compare_func, key, chunk_from))
+        if key is not None:
+            buffered.extend(chunk)
+    del chunk
+
+    chunks = await asyncio.gather(*futures)
+    del futures
+
+    async for batch in _merged_batches(chunks, compare_func if key is None else None, merge_steps):
+        if key is None:
+            for record in batch:
+                yield record
+        else:
+            for _, position in batch:
+                yield buffered[position]
@@ -1,6 +1,17 @@
+import asyncio
+import bisect
 import sort
+import sort.aio
+import sort.__main__
+import benchmark
 import unittest
 import random
+import tempfile
+import os
+import array
+import struct
+import subprocess
+import sys
 
 class SortTestFunctions(unittest.TestCase):
     def setUp(self):
@@ -13,20 +24,18 @@ class SortTestFunctions(unittest.TestCase):
             [2, 1, 1, 1],
             [1, 2, 1, 2],
             [4, 3, 2, 1],
-            [i for i in random.sample(xrange(0, 1000000000), 1000)],
-            [1 for i in xrange(0, 1000)],
-            [1 if i < 900 else 2 for i in xrange(0, 1000)],
-            [2 if i < 100 else 1 for i in xrange(0, 1000)],
-            [i if 1 < 50 else 2 for i in xrange(0, 100)] * 10,
-            [i for i in xrange(1000, 0, -1)]
+            [i for i in random.sample(range(0, 1000000000), 1000)],
+            [1 for i in range(0, 1000)],
+            [1 if i < 900 else 2 for i in range(0, 1000)],
+            [2 if i < 100 else 1 for i in range(0, 1000)],
+            [i if 1 < 50 else 2 for i in range(0, 100)] * 10,
+            [i for i in range(1000, 0, -1)]
         ]
 
     def _isSorted(self, sequence):
-        prev = None
-        for item in sequence:
-            if item < prev:
+        for i in range(1, len(sequence)):
+            if sequence[i] < sequence[i - 1]:
                 return False
-            prev = item
         return True
 
     @staticmethod
@@ -37,9 +46,9 @@ class SortTestFunctions(unittest.TestCase):
 
     def _test_sort(self, sort_func_name, *args):
         sort_func = getattr(sort, sort_func_name)
-        for range in self.ranges:
-            sort_func(range, None, *args)
-            self.assertTrue(self._isSorted(range))
+        for sequence in self.ranges:
+            sort_func(sequence, None, *args)
+            self.assertTrue(self._isSorted(sequence))
         self.assertRaises(TypeError, sort_func, (1, 2, 3), None, *args)
         self.assertRaises(TypeError, sort_func, 'hello', None, *args)
         self.assertRaises(TypeError, sort_func, [1, 2, 3], 'some_func', *args)
@@ -51,9 +60,33 @@ class SortTestFunctions(unittest.TestCase):
         ]
         for sorted_range in sorted_ranges:
             sort_func(sorted_range, self.compareTupples, *args)
-            for i in xrange(len(sorted_range)):
+            for i in range(len(sorted_range)):
                 self.assertTrue(i == sorted_range[i][1])
 
+        # Check key mode
+        for sequence in self.ranges:
+            sequence = [(-item, str(item)) for item in sequence]
+            sort_func(sequence, None, *args, key=lambda item: -item[0])
+            self.assertTrue(self._isSorted([-item[0] for item in sequence]))
+        keyed_range = [(3, 0), (1, 1), (2, 2), (1, 3), (3, 4), (2, 5)]
+        sort_func(keyed_range, None, *args, key=lambda item: item[0])
+        self.assertEqual(keyed_range, [(1, 1), (1, 3), (2, 2), (2, 5), (3, 0), (3, 4)])
+        self.assertRaises(ValueError, sort_func, [1, 2, 3], sort.compare, *args, key=abs)
+
+        # Check stats collection, every comparison must be counted
+        comparisons = [0]
+        def counting_compare(a, b):
+            comparisons[0] += 1
+            return sort.compare(a, b)
+        stats = sort.SortStats()
+        sequence = [random.randint(0, 100) for i in range(0, 100)]
+        sort_func(sequence, counting_compare, *args, stats=stats)
+        self.assertTrue(self._isSorted(sequence))
+        self.assertEqual(stats.comparisons, comparisons[0])
+        self.assertTrue(stats.moves > 0 and stats.passes > 0)
+        self.assertEqual(sorted(stats.as_dict()),
+            ['comparisons', 'merges', 'moves', 'passes', 'phase.decorate', 'phase.sort', 'phase.undecorate'])
+
     def test_bubble_sort(self):
         self._test_sort('bubble_sort')
 
@@ -75,12 +108,729 @@ class SortTestFunctions(unittest.TestCase):
     def test_shell_sort_cuira_gap(self):
         self._test_sort('shell_sort', 'cuira')
 
+    def test_shell_sort_gap_sequences(self):
+        for gap_sequence in ('frank_lazarus', 'hibbard', 'papernov_stasevich', 'pratt', 'knuth',
+                'incerpi_sedgewick', 'sedgewick', 'sedgewick2', 'gonnet_baeza_yatez', 'tokuda'):
+            self._test_sort('shell_sort', gap_sequence)
+        self.assertRaises(ValueError, sort.shell_sort, [1, 2, 3], None, 'unknown')
+
+    def test__gap_sequence(self):
+        self.assertEqual(sort._gap_sequence('cuira', 1000), [701, 301, 132, 57, 23, 10, 4, 1])
+        self.assertEqual(sort._gap_sequence('cuira', 4000), [3548, 1577, 701, 301, 132, 57, 23, 10, 4, 1])
+        self.assertEqual(sort._gap_sequence('incerpi_sedgewick', 1000), [861, 336, 112, 48, 21, 7, 3, 1])
+        self.assertEqual(sort._gap_sequence('sedgewick2', 1000), [929, 505, 209, 109, 41, 19, 5, 1])
+        self.assertEqual(sort._gap_sequence('tokuda', 1000), [525, 233, 103, 46, 20, 9, 4, 1])
+        self.assertEqual(sort._gap_sequence('pratt', 10), [9, 8, 6, 4, 3, 2, 1])
+        self.assertEqual(sort._gap_sequence('knuth', 0), [])
+        sort._gap_sequence('hibbard', 1000)
+        self.assertEqual(sort._gap_sequences_cache[('hibbard', 1024)], [1023, 511, 255, 127, 63, 31, 15, 7, 3, 1])
+
     def test_comb_sort(self):
         self._test_sort('comb_sort')
 
     def test_merge_sort(self):
         self._test_sort('merge_sort')
 
+    def test_merge_sort_unique(self):
+        for sequence in self.ranges:
+            expected = sorted(set(sequence))
+            sort.merge_sort(sequence, unique=True)
+            self.assertEqual(sequence, expected)
+
+        stable_range = [(random.randint(0, 10), i) for i in range(0, 1000)]
+        expected = [min(item for item in stable_range if item[0] == item_key) for item_key in range(0, 11)]
+        keyed_range = stable_range[:]
+        sort.merge_sort(keyed_range, key=lambda item: item[0], unique=True)
+        self.assertEqual(keyed_range, expected)
+        sort.merge_sort(stable_range, self.compareTupples, unique=True)
+        self.assertEqual(stable_range, expected)
+
+        stats = sort.SortStats()
+        sort.merge_sort([1 for i in range(0, 1000)], stats=stats, unique=True)
+        self.assertEqual((stats.comparisons, stats.merges, stats.passes), (1998, 0, 1))
+
+        self.assertRaises(ValueError, sort.merge_sort, [1, 2], unique=True, reduce=max)
+        self.assertRaises(ValueError, sort.merge_sort, [1, 2], unique=True, low_memory=True)
+        self.assertRaises(ValueError, sort.merge_sort, [1, 2], sort.compare, abs, unique=True)
+
+    def test_merge_sort_reduce(self):
+        words = [random.choice(['a', 'b', 'c', 'd']) for i in range(0, 1000)]
+        counts = [(word, 1) for word in words]
+        sort.merge_sort(counts, key=lambda item: item[0], reduce=lambda a, b: (a[0], a[1] + b[1]))
+        self.assertEqual(counts, [(word, words.count(word)) for word in sorted(set(words))])
+
+        # the earlier item is always passed first
+        items = [(random.randint(0, 10), [i]) for i in range(0, 1000)]
+        expected = [(item_key, [i for item_key_i, (i,) in items if item_key_i == item_key])
+            for item_key in sorted(set(item_key for item_key, _ in items))]
+        sort.merge_sort(items, key=lambda item: item[0], reduce=lambda a, b: (a[0], a[1] + b[1]))
+        self.assertEqual(items, expected)
+
+    def test_bottom_up_merge_sort(self):
+        self._test_sort('bottom_up_merge_sort')
+
+        for collection_len in (31, 32, 33, 64, 65, 1000):
+            collection = [random.randint(0, 100) for i in range(0, collection_len)]
+            expected = sorted(collection)
+            sort.bottom_up_merge_sort(collection)
+            self.assertEqual(collection, expected)
+
+        stats = sort.SortStats()
+        sort.bottom_up_merge_sort([i for i in range(0, 1000)], stats=stats)
+        self.assertEqual((stats.merges, stats.passes), (0, 6))
+
+    def test_merge_sort_low_memory(self):
+        for sequence in self.ranges:
+            expected = sorted(sequence)
+            sort.merge_sort(sequence, low_memory=True)
+            self.assertEqual(sequence, expected)
+
+        stable_range = [(random.randint(0, 10), i) for i in range(0, 1000)]
+        expected = sorted(stable_range)
+        sort.merge_sort(stable_range, self.compareTupples, low_memory=True)
+        self.assertEqual(stable_range, expected)
+
+        stats = sort.SortStats()
+        sort.merge_sort([i for i in range(1000, 0, -1)], stats=stats, low_memory=True)
+        self.assertEqual((stats.merges, stats.passes), (999, 10))
+
+    @staticmethod
+    async def _async_records(records):
+        for record in records:
+            await asyncio.sleep(0)
+            yield record
+
+    @staticmethod
+    def _sorted_records(records, **kwargs):
+        async def sorted_list():
+            return [record async for record in sort.aio.sorted_records(records, chunk_len=100, **kwargs)]
+        return asyncio.run(sorted_list())
+
+    def test_merge_sort_async(self):
+        for sequence in self.ranges:
+            expected = sorted(sequence)
+            asyncio.run(sort.aio.merge_sort(sequence, chunk_len=100, merge_steps=10))
+            self.assertEqual(sequence, expected)
+
+        # the loop must keep running callbacks while the merge is going on
+        ticks = [0]
+        def tick():
+            ticks[0] += 1
+            loop.call_soon(tick)
+
+        collection = [random.randint(0, 10000) for i in range(0, 10000)]
+        expected = sorted(collection)
+        loop = asyncio.new_event_loop()
+        try:
+            loop.call_soon(tick)
+            loop.run_until_complete(sort.aio.merge_sort(collection, chunk_len=100, merge_steps=10))
+        finally:
+            loop.close()
+        self.assertEqual(collection, expected)
+        self.assertTrue(ticks[0] >= 1000)
+
+        stable_range = [(random.randint(0, 10), i) for i in range(0, 1000)]
+        expected = sorted(stable_range)
+        asyncio.run(sort.aio.merge_sort(stable_range, self.compareTupples, chunk_len=100))
+        self.assertEqual(stable_range, expected)
+
+        stable_range = [(random.randint(0, 10), i) for i in range(0, 1000)]
+        expected = sorted(stable_range, key=lambda item: item[0])
+        asyncio.run(sort.aio.merge_sort(stable_range, key=lambda item: item[0], chunk_len=100))
+        self.assertEqual(stable_range, expected)
+
+        self.assertRaises(TypeError, asyncio.run, sort.aio.merge_sort((1, 2, 3)))
+        self.assertRaises(ValueError, asyncio.run, sort.aio.merge_sort([], self.compareTupples, lambda item: item))
+
+    def test_sorted_records_async(self):
+        for sequence in self.ranges:
+            self.assertEqual(self._sorted_records(self._async_records(sequence)), sorted(sequence))
+            self.assertEqual(self._sorted_records(sequence), sorted(sequence))
+
+        stable_range = [(random.randint(0, 10), i) for i in range(0, 1000)]
+        self.assertEqual(self._sorted_records(self._async_records(stable_range), key=lambda item: item[0]),
+            sorted(stable_range, key=lambda item: item[0]))
+        self.assertEqual(self._sorted_records(stable_range, compare_func=self.compareTupples), sorted(stable_range))
+
+    def test_tim_sort(self):
+        self._test_sort('tim_sort')
+
+    def test_tim_sort_runs(self):
+        ranges = [
+            sorted(random.sample(range(0, 1000000000), 1000)),
+            sorted(random.sample(range(0, 1000000000), 1000), reverse=True),
+            sorted(random.sample(range(0, 1000000000), 1000)) + sorted(random.sample(range(0, 1000000000), 100)),
+            [i % 7 for i in range(0, 5000)],
+        ]
+        for sequence in ranges:
+            expected = sorted(sequence)
+            sort.tim_sort(sequence)
+            self.assertEqual(sequence, expected)
+
+        # galloping merges must keep equal items in their original order
+        stable_range = [(random.randint(0, 10), i) for i in range(0, 5000)]
+        sort.tim_sort(stable_range, key=lambda item: item[0])
+        self.assertEqual(stable_range, sorted(stable_range))
+
+    def test_intro_sort(self):
+        self._test_sort('intro_sort')
+
+        ranges = [
+            [i % 3 for i in range(0, 10000)],
+            [min(i, 10000 - i) for i in range(0, 10000)],
+            [random.random() for i in range(0, 10000)],
+        ]
+        for sequence in ranges:
+            expected = sorted(sequence)
+            sort.intro_sort(sequence)
+            self.assertEqual(sequence, expected)
+
+        # items equal by compare_func keep their order
+        stable_range = [(random.randint(0, 10), i) for i in range(0, 1000)]
+        for stats in (None, sort.SortStats()):
+            sequence = stable_range[:]
+            sort.intro_sort(sequence, self.compareTupples, stats=stats)
+            self.assertEqual(sequence, sorted(stable_range))
+
+    def test__heap_sort(self):
+        sequence = [random.randint(0, 100) for i in range(0, 1000)]
+        expected = sequence[:100] + sorted(sequence[100:900]) + sequence[900:]
+        sort._heap_sort(sequence, 100, 900)
+        self.assertEqual(sequence, expected)
+
+    def test_sort(self):
+        for sequence in self.ranges:
+            expected = sorted(sequence)
+            sort.sort(sequence)
+            self.assertEqual(sequence, expected)
+
+        numpy_engine = 'numeric_sort' if sort._import_numpy() is not None else None
+        cases = [
+            ([3, 1, 2], {}, 'insertion_sort'),
+            ([i for i in range(0, 1000)] + [i for i in range(0, 10)], {}, 'tim_sort'),
+            ([random.randint(0, 100) for i in range(0, 1000)], {}, numpy_engine or 'counting_sort'),
+            ([random.randint(0, 2 ** 30) for i in range(0, 1000)], {}, numpy_engine or 'radix_sort'),
+            ([str(random.randint(0, 10)) for i in range(0, 1000)], {}, 'tim_sort'),
+            ([str(random.randint(0, 10)) for i in range(0, 1000)], {'stable': False}, 'intro_sort'),
+            ([(random.randint(0, 100), i) for i in range(0, 1000)], {'key': lambda item: item[0]}, 'counting_sort'),
+            ([(random.randint(0, 2 ** 30), i) for i in range(0, 1000)], {'key': lambda item: item[0]}, 'radix_sort'),
+            ([(random.random(), i) for i in range(0, 1000)], {'key': lambda item: item[0]}, 'tim_sort'),
+        ]
+        for collection, kwargs, engine in cases:
+            expected = sorted(collection, key=kwargs.get('key'))
+            self.assertEqual(sort.sort(collection, **kwargs), engine)
+            self.assertEqual(collection, expected)
+
+        self.assertRaises(TypeError, sort.sort, (1, 2, 3))
+
+    def test_argsort(self):
+        for sequence in self.ranges:
+            order = sort.argsort(sequence)
+            self.assertIsInstance(order, array.array)
+            self.assertEqual([sequence[i] for i in order], sorted(sequence))
+
+        collection = [(random.randint(0, 10), i) for i in range(0, 1000)]
+        order = sort.argsort(collection, key=lambda item: item[0])
+        self.assertEqual([collection[i] for i in order], sorted(collection, key=lambda item: item[0]))
+        order = sort.argsort(collection, key=lambda item: item[0], stable=False)
+        self.assertEqual([collection[i][0] for i in order], sorted(item[0] for item in collection))
+
+    def test_lexsort(self):
+        names = [random.choice(['a', 'b', 'c']) for i in range(0, 1000)]
+        ages = [random.randint(0, 20) for i in range(0, 1000)]
+        rows = list(zip(names, ages, range(0, 1000)))
+
+        order = sort.lexsort([names, ages])
+        self.assertEqual([rows[i] for i in order], sorted(rows))
+
+        order = sort.lexsort([names, ages], descending=[False, True])
+        self.assertEqual([rows[i] for i in order], sorted(rows, key=lambda row: (row[0], -row[1], row[2])))
+
+        order = sort.lexsort([ages], descending=True)
+        self.assertEqual([rows[i] for i in order], sorted(rows, key=lambda row: (-row[1], row[2])))
+
+        self.assertRaises(ValueError, sort.lexsort, [])
+        self.assertRaises(ValueError, sort.lexsort, [names, ages[1:]])
+        self.assertRaises(ValueError, sort.lexsort, [names, ages], [True])
+
+    def test_apply_permutation(self):
+        for sequence in self.ranges:
+            expected = sorted(sequence)
+            order = sort.argsort(sequence)
+            sort.apply_permutation(sequence, order)
+            self.assertEqual(sequence, expected)
+
+        keys = [random.randint(0, 100) for i in range(0, 1000)]
+        values = array.array('l', [key * 2 for key in keys])
+        order = sort.argsort(keys)
+        sort.apply_permutation(keys, order)
+        sort.apply_permutation(values, order)
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(list(values), [key * 2 for key in keys])
+
+        self.assertRaises(ValueError, sort.apply_permutation, [1, 2, 3], [0, 1])
+        self.assertRaises(ValueError, sort.apply_permutation, [1, 2, 3], [0, 1, 1])
+        self.assertRaises(ValueError, sort.apply_permutation, [1, 2, 3], [0, 1, 3])
+
+    def test_network_sort(self):
+        # a network sorting every sequence of 0 and 1 sorts everything
+        for collection_len in range(0, 17):
+            kernel = sort._network_kernel(collection_len)
+            for bits in range(0, 1 << collection_len):
+                collection = [(bits >> i) & 1 for i in range(0, collection_len)]
+                kernel(collection)
+                self.assertTrue(self._isSorted(collection))
+
+        for sequence in self.ranges[:8]:
+            expected = sorted(sequence)
+            sort.network_sort(sequence)
+            self.assertEqual(sequence, expected)
+
+        stable_range = [(random.randint(0, 3), i) for i in range(0, 16)]
+        sort.network_sort(stable_range, self.compareTupples)
+        self.assertEqual(stable_range, sorted(stable_range))
+        random.shuffle(stable_range)
+        expected = sorted(stable_range, key=lambda item: item[0])
+        sort.network_sort(stable_range, key=lambda item: item[0])
+        self.assertEqual(stable_range, expected)
+
+        stats = sort.SortStats()
+        sort.network_sort([16 - i for i in range(0, 16)], stats=stats)
+        self.assertEqual(stats.comparisons, 60)
+
+        self.assertRaises(TypeError, sort.network_sort, (1, 2, 3))
+        self.assertRaises(ValueError, sort.network_sort, [i for i in range(0, 17)])
+
+    def test_sort_many(self):
+        collections = [[random.randint(0, 10) for i in range(0, random.randint(0, 20))] for j in range(0, 1000)]
+        expected = [sorted(collection) for collection in collections]
+        sort.sort_many(collections)
+        self.assertEqual(collections, expected)
+
+        collections = [[(random.randint(0, 3), i) for i in range(0, random.randint(0, 20))] for j in range(0, 1000)]
+        expected = [sorted(collection, key=lambda item: item[0]) for collection in collections]
+        sort.sort_many(collections, key=lambda item: item[0])
+        self.assertEqual(collections, expected)
+
+    def test_select(self):
+        for sequence in self.ranges:
+            expected = sorted(sequence)
+            for k in set([0, len(sequence) // 2, len(sequence) - 1]):
+                if sequence:
+                    self.assertEqual(sort.select(sequence, k), expected[k])
+                    self.assertTrue(max(sequence[:k] or [expected[k]]) <= sequence[k] <= min(sequence[k:]))
+            self.assertEqual(sorted(sequence), expected)
+
+        # median of medians fallback pivot must split the sequence reasonably
+        sequence = [random.random() for i in range(0, 1000)]
+        pivot = sort._median_of_medians(sequence, 0, len(sequence))
+        self.assertTrue(len([item for item in sequence if item < pivot]) >= 300)
+        self.assertTrue(len([item for item in sequence if item > pivot]) >= 300)
+
+        # with the worst quickselect pivots the partitioned ranges still add up to O(n)
+        partition, choose_pivot = sort._partition, sort._choose_pivot
+        partitioned = [0]
+        def counting_partition(collection, sort_from, sort_to, pivot):
+            partitioned[0] += sort_to - sort_from
+            return partition(collection, sort_from, sort_to, pivot)
+        sort._partition = counting_partition
+        sort._choose_pivot = lambda collection, sort_from, sort_to: min(collection[sort_from:sort_to])
+        try:
+            sequence = [random.random() for i in range(0, 10000)]
+            self.assertEqual(sort.select(sequence, 9000), sorted(sequence)[9000])
+        finally:
+            sort._partition, sort._choose_pivot = partition, choose_pivot
+        self.assertTrue(partitioned[0] < 10 * len(sequence))
+
+        self.assertEqual(sort.select([(2, 'b'), (1, 'a'), (3, 'c')], 1, key=lambda item: item[0]), (2, 'b'))
+        self.assertRaises(IndexError, sort.select, [1, 2, 3], 3)
+        self.assertRaises(TypeError, sort.select, (1, 2, 3), 1)
+
+    def test_partial_sort(self):
+        for sequence in self.ranges:
+            expected = sorted(sequence)
+            for k in (0, 1, 10, len(sequence), len(sequence) + 1):
+                sort.partial_sort(sequence, k)
+                self.assertEqual(sequence[:k], expected[:k])
+                self.assertEqual(sorted(sequence), expected)
+
+        stable_range = [(random.randint(0, 10), i) for i in range(0, 1000)]
+        expected = sorted(stable_range)
+        sort.partial_sort(stable_range, 100, key=lambda item: item[0])
+        self.assertEqual(stable_range[:100], expected[:100])
+        stable_range.sort(key=lambda item: item[1])
+        sort.partial_sort(stable_range, 100, self.compareTupples)
+        self.assertEqual(stable_range[:100], expected[:100])
+
+        self.assertRaises(ValueError, sort.partial_sort, [1, 2, 3], -1)
+        self.assertRaises(TypeError, sort.partial_sort, (1, 2, 3), 1)
+
+    def test_nsmallest_nlargest(self):
+        for sequence in self.ranges:
+            self.assertEqual(sort.nsmallest(iter(sequence), 10), sorted(sequence)[:10])
+            self.assertEqual(sort.nlargest(iter(sequence), 10), sorted(sequence, reverse=True)[:10])
+        sequence = [(random.randint(0, 10), i) for i in range(0, 1000)]
+        self.assertEqual(sort.nsmallest(sequence, 5, self.compareTupples), sorted(sequence)[:5])
+        self.assertEqual(sort.nlargest(sequence, 5, key=lambda item: item[0]),
+            sorted(sequence, key=lambda item: item[0], reverse=True)[:5])
+        self.assertRaises(ValueError, sort.nsmallest, sequence, 5, self.compareTupples, abs)
+
+    def test_sorted_list(self):
+        for kwargs in ({}, {'block_size': 4}, {'key': lambda item: -item, 'block_size': 3},
+                {'compare_func': sort.compare, 'block_size': 5}):
+            key = kwargs.get('key')
+            sorted_list = sort.SortedList(**kwargs)
+            expected = []
+            for i in range(0, 300):
+                item = random.randint(0, 50)
+                if random.random() < 0.3 and expected:
+                    item = random.choice(expected)
+                    sorted_list.remove(item)
+                    expected.remove(item)
+                else:
+                    sorted_list.add(item)
+                    expected.append(item)
+                expected.sort(key=key)
+                self.assertEqual(list(sorted_list), expected)
+                self.assertEqual(len(sorted_list), len(expected))
+                # positions follow adds and removes which don't split or join blocks
+                self.assertEqual([sorted_list[i] for i in range(0, len(expected))], expected)
+                if key is None:
+                    self.assertEqual(sorted_list.bisect_left(item), bisect.bisect_left(expected, item))
+                    self.assertEqual(sorted_list.bisect_right(item), bisect.bisect_right(expected, item))
+
+            batch = [random.randint(0, 100) for i in range(0, 200)]
+            sorted_list.update(batch)
+            expected = sorted(expected + batch, key=key)
+            self.assertEqual(list(sorted_list), expected)
+            self.assertEqual(sorted_list[0], expected[0])
+            self.assertEqual(sorted_list[-1], expected[-1])
+            self.assertTrue(expected[10] in sorted_list)
+            self.assertFalse(1000 in sorted_list)
+            self.assertRaises(ValueError, sorted_list.remove, 1000)
+            self.assertRaises(IndexError, sorted_list.__getitem__, len(expected))
+
+        sorted_list = sort.SortedList([random.randint(0, 100) for i in range(0, 1000)], block_size=16)
+        expected = list(sorted_list)
+        self.assertEqual(expected, sorted(expected))
+        for item in (-1, 0, 50, 100, 101):
+            self.assertEqual(sorted_list.bisect_left(item), len([i for i in expected if i < item]))
+            self.assertEqual(sorted_list.bisect_right(item), len([i for i in expected if i <= item]))
+        self.assertEqual(list(sorted_list.irange(20, 30)), [i for i in expected if 20 <= i <= 30])
+        self.assertEqual(list(sorted_list.irange(20, 30, (False, False))), [i for i in expected if 20 < i < 30])
+        self.assertEqual(list(sorted_list.irange(None, 10)), [i for i in expected if i <= 10])
+        self.assertEqual(list(sorted_list.irange(90)), [i for i in expected if i >= 90])
+
+        # lists built from an iterable or by a long update stay consistent under
+        # later adds and removes
+        for kwargs in ({'block_size': 2}, {'key': lambda item: -item, 'block_size': 2}):
+            key = kwargs.get('key')
+            expected = [random.randint(0, 50) for i in range(0, 100)]
+            sorted_list = sort.SortedList(expected, **kwargs)
+            sorted_list.update([random.randint(0, 50) for i in range(0, 100)])
+            expected = list(sorted_list)
+            for i in range(0, 300):
+                if random.random() < 0.5:
+                    item = random.choice(expected)
+                    sorted_list.remove(item)
+                    expected.remove(item)
+                else:
+                    item = random.randint(0, 50)
+                    sorted_list.add(item)
+                    expected.append(item)
+                expected.sort(key=key)
+                self.assertEqual(list(sorted_list), expected)
+                self.assertEqual(len(sorted_list), len(expected))
+                # positions follow adds and removes which don't split or join blocks
+                self.assertEqual([sorted_list[i] for i in range(0, len(expected))], expected)
+                if key is None:
+                    self.assertEqual(sorted_list.bisect_left(item), bisect.bisect_left(expected, item))
+                    self.assertEqual(sorted_list.bisect_right(item), bisect.bisect_right(expected, item))
+
+        # equal keys keep the order of insertion
+        sorted_list = sort.SortedList([(1, 'a'), (0, 'b')], key=lambda item: item[0])
+        sorted_list.update([(1, 'c'), (0, 'd')] * 3)
+        sorted_list.add((1, 'e'))
+        self.assertEqual([item[1] for item in sorted_list], ['b', 'd', 'd', 'd', 'a', 'c', 'c', 'c', 'e'])
+
+        self.assertRaises(ValueError, sort.SortedList, [], sort.compare, abs)
+
+    def test_parallel_merge_sort(self):
+        for sequence in self.ranges:
+            expected = sorted(sequence)
+            sort.parallel_merge_sort(sequence, workers=3, threshold=0)
+            self.assertEqual(sequence, expected)
+
+        sequence = [random.randint(0, 1000) for i in range(0, 1000)]
+        expected = sorted(sequence)
+        sort.parallel_merge_sort(sequence, sort.compare, workers=2, threshold=0)
+        self.assertEqual(sequence, expected)
+
+        stable_range = [(random.randint(0, 10), i) for i in range(0, 1000)]
+        expected = sorted(stable_range)
+        sort.parallel_merge_sort(stable_range, key=lambda item: item[0], workers=4, threshold=0)
+        self.assertEqual(stable_range, expected)
+
+        stats = sort.SortStats()
+        stable_range.sort(key=lambda item: item[1])
+        sort.parallel_merge_sort(stable_range, key=lambda item: item[0], workers=4, threshold=0, stats=stats)
+        self.assertEqual(stable_range, expected)
+        # 4 chunks are merged in the workers and 3 merges join them
+        self.assertTrue(stats.merges > 3 and stats.comparisons > 0)
+        self.assertTrue('chunks' in stats.phases and 'undecorate' in stats.phases)
+
+        # short lists are sorted without importing multiprocessing
+        result = subprocess.run([sys.executable, '-c', 'import sys, sort; sort.parallel_merge_sort([3, 1, 2]); '
+            'print("multiprocessing" in sys.modules)'], stdout=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        self.assertEqual(result.stdout.strip(), b'False')
+
+        self.assertRaises(TypeError, sort.parallel_merge_sort, (1, 2, 3))
+        self.assertRaises(ValueError, sort.parallel_merge_sort, [1, 2, 3], sort.compare, abs)
+
+    def _test_numeric_sort(self, use_numpy):
+        for sequence in self.ranges:
+            expected = sequence[:]
+            sort.merge_sort(expected)
+            sort.numeric_sort(sequence, use_numpy)
+            self.assertEqual(sequence, expected)
+
+        mixed_range = [3, 1.0, 2 ** 70, -5, 1, 2.5, True, float('inf')]
+        expected = mixed_range[:]
+        sort.merge_sort(expected)
+        sort.numeric_sort(mixed_range, use_numpy)
+        self.assertEqual([(type(item), item) for item in mixed_range], [(type(item), item) for item in expected])
+
+        for typecode in ('l', 'd'):
+            sequence = array.array(typecode, [random.randint(-1000, 1000) for i in range(0, 1000)])
+            expected = array.array(typecode, sorted(sequence))
+            sort.numeric_sort(sequence, use_numpy)
+            self.assertEqual(sequence, expected)
+
+        self.assertRaises(TypeError, sort.numeric_sort, (1, 2, 3), use_numpy)
+        self.assertRaises(TypeError, sort.numeric_sort, 'hello', use_numpy)
+
+    def test_numeric_sort_python(self):
+        self._test_numeric_sort(False)
+
+    @unittest.skipIf(sort._import_numpy() is None, 'NumPy is not installed')
+    def test_numeric_sort_numpy(self):
+        self._test_numeric_sort(True)
+
+        numpy = sort._import_numpy()
+        sequence = numpy.array([random.randint(-1000, 1000) for i in range(0, 1000)])
+        expected = sorted(sequence.tolist())
+        sort.numeric_sort(sequence)
+        self.assertEqual(sequence.tolist(), expected)
+        self.assertRaises(ValueError, sort.numeric_sort, numpy.zeros((2, 2)))
+
+    def _test_distribution_sort(self, sort_func, *args):
+        for sequence in self.ranges:
+            if sort_func is sort.counting_sort and sequence and max(sequence) - min(sequence) > 1000000:
+                continue
+            expected = sorted(sequence)
+            sort_func(sequence, None, *args)
+            self.assertEqual(sequence, expected)
+
+        signed_range = [random.randint(-1000, 1000) for i in range(0, 1000)]
+        expected = sorted(signed_range)
+        sort_func(signed_range, None, *args)
+        self.assertEqual(signed_range, expected)
+
+        stable_range = [(random.randint(-10, 10), i) for i in range(0, 1000)]
+        sort_func(stable_range, lambda item: item[0], *args)
+        self.assertEqual(stable_range, sorted(stable_range))
+
+        self.assertRaises(TypeError, sort_func, (1, 2, 3), None, *args)
+        self.assertRaises(TypeError, sort_func, 'hello', None, *args)
+
+    def test_counting_sort(self):
+        self._test_distribution_sort(sort.counting_sort)
+
+        stats = sort.SortStats()
+        sort.counting_sort([random.randint(0, 100) for i in range(0, 100)], stats=stats)
+        self.assertEqual((stats.passes, stats.moves), (1, 100))
+
+    def test_radix_sort(self):
+        self._test_distribution_sort(sort.radix_sort)
+        self._test_distribution_sort(sort.radix_sort, 3)
+        self._test_distribution_sort(sort.radix_sort, 16)
+
+        big_range = [random.randint(-2 ** 70, 2 ** 70) for i in range(0, 1000)]
+        expected = sorted(big_range)
+        sort.radix_sort(big_range)
+        self.assertEqual(big_range, expected)
+
+        for alphabet in ('ab', 'abcdefghij'):
+            string_range = [''.join(random.choice(alphabet) for j in range(random.randint(0, 8)))
+                for i in range(0, 1000)]
+            expected = sorted(string_range)
+            sort.radix_sort(string_range)
+            self.assertEqual(string_range, expected)
+
+            stable_range = [(item, i) for i, item in enumerate(string_range)]
+            random.shuffle(stable_range)
+            expected = sorted(stable_range, key=lambda item: item[0])
+            sort.radix_sort(stable_range, lambda item: item[0])
+            self.assertEqual(stable_range, expected)
+
+        stats = sort.SortStats()
+        sort.radix_sort([random.randint(0, 2 ** 16 - 1) for i in range(0, 100)], stats=stats)
+        self.assertEqual(stats.passes, 2)
+
+        self.assertRaises(TypeError, sort.radix_sort, [1.5, 2.5])
+        self.assertRaises(ValueError, sort.radix_sort, [1, 2], None, 0)
+
+    def test_bucket_sort(self):
+        self._test_distribution_sort(sort.bucket_sort)
+        self._test_distribution_sort(sort.bucket_sort, 10)
+
+        float_range = [random.random() for i in range(0, 1000)]
+        expected = sorted(float_range)
+        sort.bucket_sort(float_range)
+        self.assertEqual(float_range, expected)
+
+        stats = sort.SortStats()
+        sort.bucket_sort(float_range, stats=stats)
+        self.assertEqual((stats.passes, stats.moves), (1, 1000))
+
+        self.assertRaises(ValueError, sort.bucket_sort, [1, 2], None, 0)
+
+    def test_external_sort(self):
+        for sequence in self.ranges:
+            self.assertEqual(list(sort.external_sort(sequence, memory_limit=1024, fan_in=2)), sorted(sequence))
+            self.assertEqual(list(sort.external_sort(sequence)), sorted(sequence))
+
+        stable_range = [(random.randint(0, 10), i) for i in range(0, 5000)]
+        self.assertEqual(list(sort.external_sort(stable_range, key=lambda item: item[0], memory_limit=4096, fan_in=3)),
+            sorted(stable_range))
+        self.assertEqual(list(sort.external_sort(stable_range, self.compareTupples, memory_limit=4096)),
+            sorted(stable_range))
+
+        stats = sort.SortStats()
+        list(sort.external_sort(stable_range, key=lambda item: item[0], memory_limit=4096, fan_in=3, stats=stats))
+        self.assertTrue(stats.comparisons > 0 and stats.passes > 0)
+        self.assertTrue('runs' in stats.phases)
+
+        self.assertRaises(ValueError, list, sort.external_sort([1, 2, 3], fan_in=1))
+        self.assertRaises(ValueError, list, sort.external_sort([1, 2, 3], sort.compare, key=abs))
+
+    def test_external_sort_file(self):
+        source = tempfile.NamedTemporaryFile('w', delete=False)
+        destination = tempfile.NamedTemporaryFile('w', delete=False)
+        try:
+            lines = [str(random.randint(0, 1000)) for i in range(0, 1000)]
+            source.write('\n'.join(lines))
+            source.close()
+            destination.close()
+            sort.external_sort_file(source.name, destination.name, key=int, memory_limit=4096, fan_in=4)
+            with open(destination.name) as sorted_file:
+                self.assertEqual(sorted_file.read().splitlines(), sorted(lines, key=int))
+        finally:
+            os.remove(source.name)
+            os.remove(destination.name)
+
+    def _sort_lines(self, lines, *args):
+        source = tempfile.NamedTemporaryFile('wb', delete=False)
+        try:
+            source.write(b'\n'.join(lines))
+            source.close()
+            self.assertEqual(sort.__main__.main([source.name, '-o', source.name, '-S', '1K'] + list(args)), 0)
+            with open(source.name, 'rb') as sorted_file:
+                return sorted_file.read().splitlines()
+        finally:
+            os.remove(source.name)
+
+    def test_command_line(self):
+        lines = [('%d\t%s' % (random.randint(-100, 100), random.choice('abc'))).encode() for i in range(0, 1000)]
+        self.assertEqual(self._sort_lines(lines), sorted(lines))
+        self.assertEqual(self._sort_lines(lines, '-r'), sorted(lines, reverse=True))
+        self.assertEqual(self._sort_lines(lines, '-n'), sorted(lines, key=lambda line: (int(line.split()[0]), line)))
+        self.assertEqual(self._sort_lines(lines, '-k', '2', '-s'), sorted(lines, key=lambda line: line.split()[1]))
+        self.assertEqual(self._sort_lines(lines, '-t', '\t', '-k', '2,2', '-k', '1', '-r', '-s'),
+            sorted(lines, key=lambda line: (line.split()[1], line.split()[0]), reverse=True))
+
+        fields = [line.split()[1] for line in lines]
+        self.assertEqual(self._sort_lines(lines, '-k', '2', '-u'),
+            [lines[fields.index(field)] for field in sorted(set(fields))])
+        self.assertEqual(self._sort_lines(lines, '-k', '2', '-r', '-s', '-u'),
+            [lines[fields.index(field)] for field in sorted(set(fields), reverse=True)])
+        self.assertEqual(self._sort_lines([b'b', b'10', b'9', b'-1.5', b'a']), [b'-1.5', b'10', b'9', b'a', b'b'])
+        # key without POS2 extends to the end of line, unique keeps the first input line of a group
+        self.assertEqual(self._sort_lines([b'x a c', b'x a b', b'y a'], '-k', '2', '-s'), [b'y a', b'x a b', b'x a c'])
+        self.assertEqual(self._sort_lines([b'b 2', b'b 10'], '-u', '-k', '1,1'), [b'b 2'])
+        self.assertEqual(self._sort_lines([b'b 10', b'b 2'], '-u', '-k', '1,1'), [b'b 10'])
+        self.assertEqual(self._sort_lines([b'b', b'10', b'9', b'-1.5', b'a'], '-n'), [b'-1.5', b'a', b'b', b'9', b'10'])
+
+        # without -t fields include their leading blanks, as in LC_ALL=C sort
+        blank_lines = [b'a  b 1', b' a b 2', b'b   a', b'  c z', b'a b', b'\tx y', b'z', b' a  b']
+        self.assertEqual(self._sort_lines(blank_lines, '-k', '2,2'),
+            [b'z', b'b   a', b' a  b', b'a  b 1', b' a b 2', b'a b', b'\tx y', b'  c z'])
+        self.assertEqual(self._sort_lines(blank_lines, '-s', '-k', '1,1'),
+            [b'\tx y', b'  c z', b' a b 2', b' a  b', b'a  b 1', b'a b', b'b   a', b'z'])
+        self.assertEqual(self._sort_lines(blank_lines, '-b', '-s', '-k', '2,2'),
+            [b'z', b'b   a', b'a  b 1', b' a b 2', b'a b', b' a  b', b'\tx y', b'  c z'])
+
+        # standard input and output
+        result = subprocess.run([sys.executable, '-m', 'sort', '-n'], input=b'3\n1\n2', stdout=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        self.assertEqual(result.stdout, b'1\n2\n3\n')
+        result = subprocess.run([sys.executable, '-m', 'sort', '-'], input=b'b\na', stdout=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        self.assertEqual(result.stdout, b'a\nb\n')
+
+    def test_sort_records_file(self):
+        record = struct.Struct('>q8s')
+        records = [(random.randint(-100, 100), str(i).rjust(8).encode()) for i in range(0, 1000)]
+        expected = sorted(records, key=lambda item: item[0])
+        source = tempfile.NamedTemporaryFile('wb', delete=False)
+        destination = tempfile.NamedTemporaryFile('wb', delete=False)
+        try:
+            source.write(b''.join(record.pack(*item) for item in records))
+            source.close()
+            destination.close()
+
+            sort.sort_records_file(source.name, '>q8s', '>q', 0, destination.name)
+            with open(destination.name, 'rb') as sorted_file:
+                data = sorted_file.read()
+            self.assertEqual([record.unpack_from(data, offset) for offset in range(0, len(data), record.size)],
+                expected)
+
+            sort.sort_records_file(source.name, '>q8s', '8s', 8)
+            with open(source.name, 'rb') as sorted_file:
+                data = sorted_file.read()
+            self.assertEqual([record.unpack_from(data, offset) for offset in range(0, len(data), record.size)],
+                sorted(records, key=lambda item: item[1]))
+
+            # destination being the source sorts in place
+            sort.sort_records_file(source.name, '>q8s', '>q', 0, source.name)
+            with open(source.name, 'rb') as sorted_file:
+                data = sorted_file.read()
+            self.assertEqual([record.unpack_from(data, offset) for offset in range(0, len(data), record.size)],
+                sorted(sorted(records, key=lambda item: item[1]), key=lambda item: item[0]))
+
+            # radix sorted integer and bytes keys and unpacked multi-field keys
+            for record_format, key_format, key_offset in (('<i4s', '<i', 0), ('>H6s', '>H', 0), ('=q8s', 'q', 0),
+                    ('8s', '3s', 1), ('>hh4s', '>hh', 0)):
+                record = struct.Struct(record_format)
+                key_struct = struct.Struct(key_format)
+                data = bytes(random.getrandbits(8) for i in range(0, record.size * 500))
+                with open(source.name, 'wb') as source_file:
+                    source_file.write(data)
+                sort.sort_records_file(source.name, record_format, key_format, key_offset, destination.name)
+                records = [data[offset:offset + record.size] for offset in range(0, len(data), record.size)]
+                expected = sorted(records, key=lambda item: key_struct.unpack_from(item, key_offset))
+                with open(destination.name, 'rb') as sorted_file:
+                    data = sorted_file.read()
+                self.assertEqual([data[offset:offset + record.size] for offset in range(0, len(data), record.size)],
+                    expected)
+
+            self.assertRaises(ValueError, sort.sort_records_file, source.name, '>q8s', '>q', 12)
+            self.assertRaises(ValueError, sort.sort_records_file, source.name, '>q7s', '>q')
+        finally:
+            os.remove(source.name)
+            os.remove(destination.name)
+
     def test__get_sorted_sequences(self):
         ranges = (
             [],
@@ -102,12 +852,12 @@ class SortTestFunctions(unittest.TestCase):
             [(0, 1), (2, 3)],
             [(0, 0), (1, 1), (2, 2), (3, 3)]
         )
-        for i in xrange(0, len(ranges)):
+        for i in range(0, len(ranges)):
             result = []
             for seq in sort._get_sorted_sequences(ranges[i], sort.compare):
                 result.append(seq)
             self.assertEqual(result, results[i])
-            self.assertRaises(TypeError, lambda: sort._get_sorted_sequences('hello', sort.compare).next())
+            self.assertRaises(TypeError, lambda: next(sort._get_sorted_sequences('hello', sort.compare)))
 
     def test__merge(self):
         self.assertRaises(ValueError, sort._merge, [0, 1, 2, 3, 4, 5], [] * 6, (0, 2), (4, 5), sort.compare)
@@ -126,5 +876,23 @@ class SortTestFunctions(unittest.TestCase):
         sort._merge([0, 3, 4, 5, 1, 2, 6], result, (1, 3), (4, 5), sort.compare)
         self.assertEqual(result, [None, 1, 2, 3, 4, 5, None])
 
+    def test_benchmark(self):
+        for distribution in benchmark.DISTRIBUTIONS.values():
+            data = distribution(100, random.Random(0))
+            self.assertEqual(len(data), 100)
+            self.assertEqual(data, distribution(100, random.Random(0)))
+
+        results = benchmark.run_benchmark(['merge_sort', 'counting_sort'], ['random'], [100], 1)
+        self.assertEqual([(result['sort'], result['size']) for result in results],
+            [('counting_sort', 100), ('merge_sort', 100)])
+        self.assertTrue(results[0]['comparisons'] is None)
+        self.assertTrue(results[1]['comparisons'] > 0)
+
+        self.assertEqual(benchmark.find_regressions(results, results), [])
+        slower = [dict(result, time=result['time'] + 1) for result in results]
+        self.assertEqual(len(benchmark.find_regressions(slower, results)), 2)
+        more_comparisons = [dict(result, comparisons=1000000) for result in results]
+        self.assertEqual(len(benchmark.find_regressions(more_comparisons, results)), 1)
+
 if __name__ == '__main__':
     unittest.main()